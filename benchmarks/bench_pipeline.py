@@ -0,0 +1,298 @@
+"""
+Benchmark the Forex Factory scrape -> parse -> persist pipeline offline.
+
+cloudscraper, fetch_url_async, the Mongo collections and pymongo's UpdateOne
+are replaced by local fakes, so only our own code is measured. Results are
+printed as one JSON object per line (or written to --output) for regression
+tracking.
+
+    python benchmarks/bench_pipeline.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+import dynamo_news
+
+http_module = sys.modules["dynamo_news.http"]
+scrapper = sys.modules["dynamo_news.scrapper"]
+News = dynamo_news.News
+
+IMPACTS = ["High Impact Expected", "Medium Impact Expected", "Low Impact Expected"]
+
+
+def make_events(n: int) -> list[dict]:
+    start = datetime.now(pytz.UTC) - timedelta(days=45)
+    now = datetime.now(pytz.UTC)
+    events = []
+    for i in range(n):
+        event_time = start + timedelta(minutes=90 * 24 * 60 * i / n)
+        events.append(
+            {
+                "id": 100_000 + i,
+                "name": f"Event {i % 300} m/m",
+                "dateline": int(event_time.timestamp()),
+                "timeLabel": "All Day" if i % 50 == 0 else "8:30am",
+                "impactTitle": IMPACTS[i % 3],
+                "country": "US",
+                "currency": ["USD", "EUR", "GBP", "JPY"][i % 4],
+                "actual": f"{i % 7 / 10}%" if event_time < now else "",
+                "forecast": "0.2%",
+                "previous": "0.1%",
+                "actualBetterWorse": i % 3,
+                "soloUrl": f"/calendar/{i}",
+                "ebaseId": i % max(1, n // 10),
+                "hasGraph": True,
+            }
+        )
+    return events
+
+
+def make_timeline(points: int = 200) -> list[dict]:
+    return [
+        {"dateline": 1_500_000_000 + i * 2_592_000, "actual": i % 5, "forecast": 1}
+        for i in range(points)
+    ]
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.status_code = 200
+        self.headers = {}
+        self.content = json.dumps(payload).encode()
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeScraper:
+    """Stands in for ``http.scraper`` and answers every calendar POST at once."""
+
+    def __init__(self, events: list[dict]):
+        self.events = events
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        return FakeResponse({"days": [{"events": self.events}]})
+
+    def get(self, url, headers=None, timeout=None):
+        return FakeResponse({"data": {"events": make_timeline()}})
+
+
+async def fake_fetch_url_async(u: str, return_json: bool = True, timeout: float = 0):
+    return {"data": {"events": make_timeline()}}
+
+
+class FakeCursor:
+    def __init__(self, docs: list[dict]):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+
+class InMemoryCollection:
+    """
+    The part of ``AsyncCollection`` used by the scraper, backed by a dict.
+
+    Filters are matched on equality, ``$in`` and ``$exists``; updates support
+    ``$set`` and ``$push`` with ``$each``/``$sort``/``$slice``.
+    """
+
+    def __init__(self, name: str):
+        self.full_name = f"bench.{name}"
+        self.docs: list[dict] = []
+        self.index: dict[tuple, dict] = {}
+        self.operations = 0
+        self.bulk_writes = 0
+
+    @staticmethod
+    def _matches(doc: dict, query: dict) -> bool:
+        for key, value in query.items():
+            if isinstance(value, dict) and "$in" in value:
+                if doc.get(key) not in value["$in"]:
+                    return False
+            elif isinstance(value, dict) and "$exists" in value:
+                if (key in doc) != value["$exists"]:
+                    return False
+            elif doc.get(key) != value:
+                return False
+        return True
+
+    def find(self, query: dict = None, projection: dict = None) -> FakeCursor:
+        query = {
+            key: {"$in": set(value["$in"])}
+            if isinstance(value, dict) and "$in" in value
+            else value
+            for key, value in (query or {}).items()
+        }
+        return FakeCursor([doc for doc in self.docs if self._matches(doc, query)])
+
+    async def find_one(self, query: dict, projection: dict = None):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                return doc
+
+    def _apply(self, query: dict, update: dict, upsert: bool):
+        self.operations += 1
+        key = tuple(sorted(query.items()))
+        doc = self.index.get(key)
+        if doc is None:
+            if not upsert:
+                return
+            doc = dict(query)
+            self.index[key] = doc
+            self.docs.append(doc)
+
+        doc.update(update.get("$set", {}))
+        for field, push in update.get("$push", {}).items():
+            values = doc.setdefault(field, []) + list(push["$each"])
+            for sort_key, direction in push.get("$sort", {}).items():
+                values.sort(key=lambda x: x[sort_key], reverse=direction < 0)
+            if "$slice" in push:
+                limit = push["$slice"]
+                values = values[limit:] if limit < 0 else values[:limit]
+            doc[field] = values
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False):
+        self._apply(query, update, upsert)
+
+    async def bulk_write(self, operations: list, ordered: bool = True):
+        self.bulk_writes += 1
+        for query, update, upsert in operations:
+            self._apply(query, update, upsert)
+
+
+def plain_update_one(filter: dict, update: dict, upsert: bool = False) -> tuple:
+    """Stands in for ``UpdateOne`` as a ``(filter, update, upsert)`` tuple."""
+    return filter, update, upsert
+
+
+def reset_caches():
+    scrapper.news_fingerprints.clear()
+    scrapper.timeline_freshness.clear()
+    scrapper.timeline_tails.clear()
+
+
+def timed(func, *args, **kwargs) -> tuple[float, object]:
+    started_at = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - started_at, result
+
+
+async def atimed(coro) -> tuple[float, object]:
+    started_at = time.perf_counter()
+    result = await coro
+    return time.perf_counter() - started_at, result
+
+
+def record(name: str, size: int, seconds: float, items: int, **extra) -> dict:
+    return {
+        "benchmark": name,
+        "size": size,
+        "seconds": round(seconds, 6),
+        "items": items,
+        "items_per_second": round(items / seconds, 2) if seconds else None,
+        **extra,
+    }
+
+
+async def bench_size(size: int) -> list[dict]:
+    events = make_events(size)
+    results = []
+
+    seconds, newses = timed(
+        lambda: [scrapper.parse_forexfactory_event(event) for event in events]
+    )
+    results.append(record("parse", size, seconds, len(newses)))
+
+    seconds, valid = timed(lambda: [News(**new) for new in newses])
+    results.append(record("news_validation", size, seconds, len(valid)))
+
+    reset_caches()
+    db_news = InMemoryCollection("news")
+    seconds, written = await atimed(scrapper.upsert_changed_news(db_news, newses))
+    results.append(record("bulk_write_initial", size, seconds, written))
+
+    seconds, written = await atimed(scrapper.upsert_changed_news(db_news, newses))
+    results.append(record("bulk_write_unchanged", size, seconds, written))
+
+    db_timeline = InMemoryCollection("timeline")
+    seconds, stored = await atimed(
+        scrapper.update_forexfactory_timelines(
+            newses, db_timeline, concurrency=64, rate=1e9, burst=64
+        )
+    )
+    results.append(
+        record(
+            "timeline_stage",
+            size,
+            seconds,
+            stored,
+            bulk_writes=db_timeline.bulk_writes,
+        )
+    )
+
+    reset_caches()
+    http_module.scraper = FakeScraper(events)
+    db_news, db_timeline = InMemoryCollection("news"), InMemoryCollection("timeline")
+    seconds, parsed = await atimed(
+        scrapper.update_forexfactory_calendar(
+            db_news,
+            db_timeline,
+            start_date=datetime.now(pytz.UTC),
+            end_date=datetime.now(pytz.UTC),
+            calendar_chunk=None,
+            timeline_concurrency=64,
+            timeline_rate=1e9,
+        )
+    )
+    results.append(
+        record(
+            "update_forexfactory_calendar",
+            size,
+            seconds,
+            len(parsed),
+            news_writes=db_news.operations,
+            timeline_writes=db_timeline.operations,
+        )
+    )
+    return results
+
+
+async def main(sizes: list[int]) -> list[dict]:
+    scrapper.fetch_url_async = fake_fetch_url_async
+    scrapper.UpdateOne = plain_update_one
+    results = []
+    for size in sizes:
+        results.extend(await bench_size(size))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--output", help="Write JSON lines here instead of stdout")
+    args = parser.parse_args()
+
+    meta = {"python": platform.python_version(), "time": time.time()}
+    lines = [json.dumps({**result, **meta}) for result in asyncio.run(main(args.sizes))]
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write("\n".join(lines) + "\n")
+    else:
+        print("\n".join(lines))
@@ -1,13 +1,31 @@
+from importlib import import_module as _import_module
+
+from .aio import *
 from .api import *
+from .archive import *
+from .cache import *
+from .cadence import *
+from .codec import *
 from .constant import *
+from .daemon import *
 from .db import *
 from .funcs import *
 from .http import *
+from .lease import *
 from .math import *
+from .metrics import *
 from .models import *
 from .pair_info import *
 from .plot import *
+from .retry import *
+from .scheduler import *
 from .scrapper import *
 from .sender import *
+from .sources import *
+from .watcher import *
+
+# the star imports re-export the ``metrics`` registry, keep the name for the
+# submodule like ``http`` (the shared client is ``get_client()``)
+metrics = _import_module(".metrics", __name__)
 
-__version__ = "0.0.4"
\ No newline at end of file
+__version__ = "0.1.0"
\ No newline at end of file
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import logging
+import os
+from datetime import timedelta
+
+from pymongo import AsyncMongoClient
+
+from dynamo_news.daemon import create_supervisor, run_daemon
+from dynamo_news.http import get_client, release_executor, scraper_executor
+from dynamo_news.lease import MongoLease
+from dynamo_news.models import NewsSource
+from dynamo_news.scrapper import (
+    ForexFactorySource,
+    set_calendar_sources,
+    set_scrape_lease,
+)
+from dynamo_news.sources import InvestingSource
+
+CALENDAR_SOURCES = {
+    NewsSource.FOREX_FACTORY.value: ForexFactorySource,
+    NewsSource.INVESTING.value: InvestingSource,
+}
+
+
+async def main(args: argparse.Namespace):
+    client = AsyncMongoClient(args.mongo_uri, tz_aware=True)
+    db = client[args.db]
+    set_calendar_sources([CALENDAR_SOURCES[name]() for name in args.sources])
+    lease_collection = None
+    if args.lease_collection:
+        # share the work between every instance using this collection
+        lease_collection = db[args.lease_collection]
+        set_scrape_lease(MongoLease(lease_collection, "forexfactory"))
+    supervisor = create_supervisor(
+        db_news=db[args.news_collection],
+        db_timeline=db[args.timeline_collection],
+        backfill_interval=timedelta(hours=args.backfill_hours),
+        lease_collection=lease_collection,
+    )
+    try:
+        await run_daemon(supervisor)
+    finally:
+        await get_client().aclose()
+        await client.close()
+        scraper_executor.shutdown(wait=False, cancel_futures=True)
+        release_executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="python -m dynamo_news", description="Run the calendar scraper daemon"
+    )
+    parser.add_argument(
+        "--mongo-uri", default=os.getenv("MONGO_URI", "mongodb://localhost:27017")
+    )
+    parser.add_argument("--db", default=os.getenv("MONGO_DB", "dynamo_news"))
+    parser.add_argument("--news-collection", default="news")
+    parser.add_argument("--timeline-collection", default="timeline")
+    parser.add_argument(
+        "--sources",
+        nargs="+",
+        choices=list(CALENDAR_SOURCES),
+        default=[NewsSource.FOREX_FACTORY.value],
+    )
+    parser.add_argument("--lease-collection", default=None)
+    parser.add_argument("--backfill-hours", type=float, default=6)
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=args.log_level.upper(),
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+    asyncio.run(main(args))
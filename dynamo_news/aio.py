@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+_T = TypeVar("_T")
+
+
+class TokenBucket:
+    """
+    Async token bucket rate limiter.
+
+    Parameters:
+        rate (float): Tokens added per second.
+        capacity (int): Maximum number of tokens that can be held (burst size).
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    async def acquire(self, tokens: int = 1):
+        if tokens > self.capacity:
+            raise ValueError("Cannot acquire more tokens than the bucket capacity")
+
+        # the lock keeps waiters in FIFO order so nobody starves
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+
+class SingleFlight:
+    """
+    Share one in-flight call per key between concurrent callers.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it runs await the same task and get the same result or exception.
+    Cancelling one caller does not cancel the shared call.
+    """
+
+    def __init__(self):
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    async def do(
+        self, key: Hashable, func: Callable[..., Awaitable[_T]], *args, **kwargs
+    ) -> _T:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing dependency for a while instead of hammering it.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    every call fails fast with ``CircuitOpenError``. Once the backoff has
+    passed it goes half-open and lets a single trial call through: success
+    closes it, failure opens it again with a doubled backoff. Calls that were
+    already running when the circuit opened do not move it. Backoffs start
+    at ``base_delay``, are capped at ``max_delay`` and get up to ``jitter``
+    (as a fraction) of random extra delay.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        base_delay: float = 30,
+        max_delay: float = 900,
+        jitter: float = 0.5,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.failures = 0
+        self.opened = 0
+        # increases every time the circuit opens, to spot calls started before
+        self._generation = 0
+        self._open_until = 0.0
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.failures < self.failure_threshold:
+            return self.CLOSED
+        if time.monotonic() < self._open_until:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def _open(self):
+        delay = min(self.max_delay, self.base_delay * 2**self.opened)
+        delay += delay * random.uniform(0, self.jitter)
+        self.opened += 1
+        self._generation += 1
+        self._open_until = time.monotonic() + delay
+        logging.warning(f"Circuit '{self.name}' opened for {delay:.0f}s")
+
+    def _record_success(self, state: str, generation: int):
+        if state == self.HALF_OPEN or generation == self._generation:
+            self.failures = 0
+            self.opened = 0
+
+    def _record_failure(self, state: str, generation: int):
+        if state == self.HALF_OPEN:
+            # the trial failed, back off longer
+            self._open()
+        elif generation == self._generation:
+            self.failures += 1
+            if self.failures == self.failure_threshold:
+                self._open()
+        # else the call started before the circuit opened, it says nothing new
+
+    async def call(self, func: Callable[..., Awaitable[_T]], *args, **kwargs) -> _T:
+        state = self.state
+        if state == self.OPEN or (state == self.HALF_OPEN and self._trial_running):
+            raise CircuitOpenError(
+                self.name, max(0.0, self._open_until - time.monotonic())
+            )
+
+        generation = self._generation
+        self._trial_running = state == self.HALF_OPEN
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._record_failure(state, generation)
+            raise
+        else:
+            self._record_success(state, generation)
+            return result
+        finally:
+            if state == self.HALF_OPEN:
+                self._trial_running = False
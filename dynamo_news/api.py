@@ -4,12 +4,16 @@ import pytz
 from datetime import datetime
 from typing import Union
 
+from pydantic import TypeAdapter, ValidationError
+
+from dynamo_news.codec import loads
 from dynamo_news.http import post_http, get_http
 from dynamo_news.math import calculate_pip_value
 from dynamo_news.models import NewsSource, News
 from dynamo_news.pair_info import pair_infos
 
 base_url = "http://207.180.195.191:22030"
+news_list = TypeAdapter(list[News])
 
 
 async def get_news(
@@ -26,7 +30,7 @@ async def get_news(
         raise ValueError("Dates must have timezone information")
 
     url = f"{base_url}/{source.value}"
-    response: list[dict] = await post_http(
+    content: bytes = await post_http(
         url,
         api_key=api_key,
         json={
@@ -36,10 +40,19 @@ async def get_news(
             "whitelisted_currencies": whitelisted_currencies,
             "blacklist_currencies": blacklist_currencies,
         },
+        idempotent=True,
+        coalesce=True,
+        raw=True,
     )
 
+    # validate straight from the bytes, only fall back to one by one on errors
+    try:
+        return news_list.validate_json(content)
+    except ValidationError:
+        pass
+
     newses = []
-    for news in response:
+    for news in loads(content):
         try:
             newses.append(News(**news))
         except BaseException:  # NOQA
@@ -48,18 +61,20 @@ async def get_news(
 
 
 async def get_one_news(
-    api_key: str, news_id: str, source: NewsSource
+    api_key: str, news_id: str, source: NewsSource, cache: bool = False
 ) -> Union[News, None]:
     url = f"{base_url}/get-news"
-    response = await get_http(
+    content = await get_http(
         url,
         params={
             "news_id": news_id,
             "source": source.value,
         },
         api_key=api_key,
+        cache=cache,
+        raw=True,
     )
-    return News(**response)
+    return News.model_validate_json(content)
 
 
 async def pip_diff(
@@ -103,6 +118,7 @@ async def pip_diff(
             url,
             api_key=api_key,
             json=data,
+            idempotent=True,
         )
 
         diff.update(response)
@@ -0,0 +1,60 @@
+import asyncio
+import gzip
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Union
+
+import pytz
+
+
+class ScrapeArchive:
+    """
+    Store raw scrape payloads as gzip-compressed JSON snapshots, or replay them.
+
+    Calendar responses are written to ``calendar/<begin>_<end>/<time>.json.gz``
+    and timeline responses to ``timeline/<event_id>/<time>.json.gz``. With
+    ``replay=True`` nothing is fetched; the latest snapshot for the same
+    request is loaded instead, so a replay must use the same date range and
+    chunk size as the recording.
+    """
+
+    def __init__(self, directory: Union[str, Path], replay: bool = False):
+        self.directory = Path(directory)
+        self.replay = replay
+
+    @staticmethod
+    def _calendar_key(start_date: datetime, end_date: datetime) -> str:
+        return f"{start_date:%Y-%m-%d}_{end_date:%Y-%m-%d}"
+
+    def _write(self, folder: Path, payload: Union[dict, list]) -> Path:
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / f"{datetime.now(pytz.UTC):%Y%m%dT%H%M%S%fZ}.json.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(payload, f)
+        return path
+
+    def _read_latest(self, folder: Path) -> Union[dict, list]:
+        snapshots = sorted(folder.glob("*.json.gz"))
+        if not snapshots:
+            raise FileNotFoundError(f"No archived snapshot in {folder}")
+        with gzip.open(snapshots[-1], "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    async def save_calendar(
+        self, start_date: datetime, end_date: datetime, payload: dict
+    ) -> Path:
+        folder = self.directory / "calendar" / self._calendar_key(start_date, end_date)
+        return await asyncio.to_thread(self._write, folder, payload)
+
+    async def load_calendar(self, start_date: datetime, end_date: datetime) -> dict:
+        folder = self.directory / "calendar" / self._calendar_key(start_date, end_date)
+        return await asyncio.to_thread(self._read_latest, folder)
+
+    async def save_timeline(self, event_id: int, payload: dict) -> Path:
+        folder = self.directory / "timeline" / str(event_id)
+        return await asyncio.to_thread(self._write, folder, payload)
+
+    async def load_timeline(self, event_id: int) -> dict:
+        folder = self.directory / "timeline" / str(event_id)
+        return await asyncio.to_thread(self._read_latest, folder)
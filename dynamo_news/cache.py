@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Any, Hashable, Optional
+
+from cachetools import LRUCache
+
+
+class ConditionalCache:
+    """
+    LRU store of responses that carry an ``ETag`` or ``Last-Modified`` validator.
+
+    Works with both httpx and requests responses. It is guarded by a lock
+    because the scraper threads share it with the event loop.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._responses = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            return self._responses.get(key)
+
+    def validators(self, key: Hashable) -> dict[str, str]:
+        """Conditional request headers for the response cached under ``key``."""
+        response = self.get(key)
+        if response is None:
+            return {}
+
+        headers = {}
+        if etag := response.headers.get("ETag"):
+            headers["If-None-Match"] = etag
+        if last_modified := response.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def resolve(self, key: Hashable, response: Any) -> Any:
+        """
+        Return the cached response on a 304, otherwise store ``response`` if it
+        is cacheable and return it.
+        """
+        if response.status_code == 304:
+            cached = self.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+        self.misses += 1
+        if response.status_code == 200 and (
+            "ETag" in response.headers or "Last-Modified" in response.headers
+        ):
+            with self._lock:
+                self._responses[key] = response
+        return response
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._responses.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._responses.clear()
+
+
+class ResponseCache:
+    """
+    LRU store of decoded responses with a TTL.
+
+    An entry is fresh for ``ttl`` seconds and then stale for ``stale_ttl`` more,
+    during which it can still be served while it is refreshed in the
+    background. Cached values are shared between callers and must not be
+    mutated.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 5, stale_ttl: float = 30):
+        self._entries = LRUCache(maxsize=maxsize)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def lookup(self, key: Hashable) -> Optional[tuple[Any, bool]]:
+        """``(value, is_fresh)`` for ``key``, or None when missing or expired."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age < self.ttl:
+                self.hits += 1
+                return value, True
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                return value, False
+            del self._entries[key]
+
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any):
+        self._entries[key] = (value, time.monotonic())
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+import pytz
+
+from dynamo_news.models import News
+
+
+class ScrapeCadence:
+    """
+    Choose how long to wait before the next calendar scrape.
+
+    The interval is derived from the calendar in hand: it is shortest while
+    high-impact actuals are pending or about to be released and backs off to
+    ``max_interval`` when nothing relevant is coming up.
+
+    Parameters:
+        min_interval (timedelta): Interval while actuals are pending.
+        max_interval (timedelta): Interval when the calendar is quiet.
+        min_rating (int): Ignore events rated below this.
+        pending_window (timedelta): How long after event_time an event without
+            an actual still counts as pending.
+        tiers (list[tuple[timedelta, int, timedelta]]): ``(horizon, rating,
+            interval)`` rules, checked in order. The first rule with an event of
+            at least ``rating`` within ``horizon`` sets the interval.
+    """
+
+    def __init__(
+        self,
+        min_interval: timedelta = timedelta(seconds=15),
+        max_interval: timedelta = timedelta(hours=1),
+        min_rating: int = 2,
+        pending_window: timedelta = timedelta(minutes=10),
+        tiers: list[tuple[timedelta, int, timedelta]] = None,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.min_rating = min_rating
+        self.pending_window = pending_window
+        self.tiers = tiers or [
+            (timedelta(minutes=15), 3, timedelta(seconds=30)),
+            (timedelta(hours=1), 3, timedelta(minutes=2)),
+            (timedelta(hours=1), 2, timedelta(minutes=5)),
+            (timedelta(hours=6), 2, timedelta(minutes=15)),
+        ]
+
+    def pending_actuals(
+        self, newses: list[News], now: Optional[datetime] = None
+    ) -> list[News]:
+        now = now or datetime.now(pytz.UTC)
+        return [
+            news
+            for news in newses
+            if news.rating >= self.min_rating
+            and not news.all_day
+            and not news.released
+            and news.event_time <= now <= news.event_time + self.pending_window
+        ]
+
+    def next_interval(
+        self, newses: list[News], now: Optional[datetime] = None
+    ) -> timedelta:
+        now = now or datetime.now(pytz.UTC)
+        if self.pending_actuals(newses, now):
+            return self.min_interval
+
+        upcoming = [
+            news
+            for news in newses
+            if news.rating >= self.min_rating
+            and not news.all_day
+            and news.event_time > now
+        ]
+        interval = self.max_interval
+        for horizon, rating, tier_interval in self.tiers:
+            if any(
+                news.rating >= rating and news.event_time - now <= horizon
+                for news in upcoming
+            ):
+                interval = tier_interval
+                break
+
+        # never sleep through the next release
+        if upcoming:
+            until_next = min(news.event_time for news in upcoming) - now
+            interval = min(interval, until_next)
+        return max(interval, self.min_interval)
+
+    async def run(self, scrape: Callable[[], Awaitable[list[News]]]):
+        """Call ``scrape`` forever, sleeping ``next_interval`` between calls."""
+        newses = []
+        while True:
+            try:
+                newses = await scrape()
+            except Exception as e:
+                logging.exception("Error in scheduled scrape", exc_info=e)
+
+            interval = self.next_interval(newses)
+            logging.info(f"Next calendar scrape in {interval}")
+            await asyncio.sleep(interval.total_seconds())
@@ -0,0 +1,30 @@
+import json
+from importlib.util import find_spec
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _accept_encoding() -> str:
+    # only advertise what httpx and requests can decode in this environment
+    encodings = []
+    if find_spec("zstandard"):
+        encodings.append("zstd")
+    if find_spec("brotli") or find_spec("brotlicffi"):
+        encodings.append("br")
+    encodings.append("gzip")
+    return ", ".join(encodings)
+
+
+ACCEPT_ENCODING = _accept_encoding()
+JSON_BACKEND = "orjson" if orjson else "json"
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON with orjson when it is installed, else the stdlib."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 import pytz
 from cachetools import TTLCache
 
@@ -49,6 +51,33 @@ alternative_conditional_labels = {
     ],
 }
 
+# Forex Factory impactTitle -> News.rating
+IMPACT_RATING = {
+    "High Impact Expected": 3,
+    "Medium Impact Expected": 2,
+    "Low Impact Expected": 1,
+    "Non-Economic": 1,
+}
+
+# currency -> Forex Factory calendar filter id
+FOREX_FACTORY_CURRENCIES = {
+    "AUD": 1,
+    "CAD": 2,
+    "CHF": 3,
+    "CNY": 4,
+    "EUR": 5,
+    "GBP": 6,
+    "JPY": 7,
+    "NZD": 8,
+    "USD": 9,
+}
+
+# label -> how long before event_time the scheduler fires it
+RELEASE_OFFSETS = {
+    "will be released in": timedelta(hours=1),
+    "is LIVE in": timedelta(minutes=5),
+}
+
 crypto_cid = []
 wait_for_result = TTLCache(maxsize=100, ttl=60 * 60)  # 1 hour
 forex_cid = [1248259151788904521]
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import signal
+import time
+from datetime import timedelta
+from functools import partial
+from typing import Awaitable, Callable, Optional
+
+from pymongo.asynchronous.collection import AsyncCollection
+
+from dynamo_news.cadence import ScrapeCadence
+from dynamo_news.lease import LeaseLostError, MongoLease
+from dynamo_news.models import News
+from dynamo_news.scheduler import EventScheduler
+from dynamo_news.scrapper import (
+    SOURCE_TIMEOUT,
+    scrap_with_lock,
+    update_forexfactory_calendar,
+)
+from dynamo_news.watcher import ReleaseWatcher
+
+
+class Service:
+    """
+    A long-running coroutine run by the ``Supervisor``.
+
+    Parameters:
+        name (str): Name used in logs.
+        factory: Called to start (and restart) the service.
+        restart (str): ``"always"`` restarts it even when it returns,
+            ``"on-failure"`` only when it raises and ``"never"`` not at all.
+        backoff (float): Seconds before the first restart, doubled after each
+            quick failure up to ``max_backoff``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Awaitable[None]],
+        restart: str = "on-failure",
+        backoff: float = 5,
+        max_backoff: float = 300,
+    ):
+        if restart not in ("always", "on-failure", "never"):
+            raise ValueError(f"Unknown restart policy: {restart}")
+
+        self.name = name
+        self.factory = factory
+        self.restart = restart
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.restarts = 0
+
+
+class Supervisor:
+    """
+    Run services side by side in an ``asyncio.TaskGroup``.
+
+    A failing service is restarted according to its policy without touching
+    the others. ``stop`` cancels every service and ``run`` returns once they
+    have all finished cleaning up.
+    """
+
+    def __init__(self, services: list[Service] = None):
+        self.services = services or []
+        self._stop = asyncio.Event()
+
+    def add(self, service: Service):
+        self.services.append(service)
+
+    def stop(self):
+        self._stop.set()
+
+    async def run(self):
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(self._supervise(service), name=service.name)
+                for service in self.services
+            ]
+            stop = tg.create_task(self._stop.wait())
+            # services that end on their own must not stop us listening to stop
+            running = set(tasks)
+            while running and not stop.done():
+                done, _ = await asyncio.wait(
+                    {stop, *running}, return_when=asyncio.FIRST_COMPLETED
+                )
+                running -= done
+            stop.cancel()
+
+            logging.info("Stopping services...")
+            for task in tasks:
+                task.cancel()
+
+    async def _supervise(self, service: Service):
+        backoff = service.backoff
+        while True:
+            started_at = time.monotonic()
+            try:
+                logging.info(f"Starting {service.name}")
+                await service.factory()
+                if service.restart != "always":
+                    return
+                logging.info(f"{service.name} finished, restarting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.exception(f"{service.name} failed", exc_info=e)
+                if service.restart == "never":
+                    return
+
+            # a service that ran for a while starts again from the base backoff
+            if time.monotonic() - started_at > service.max_backoff:
+                backoff = service.backoff
+            service.restarts += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, service.max_backoff)
+
+
+async def run_leased(lease: MongoLease, factory: Callable[[], Awaitable[None]]):
+    """
+    Run ``factory`` only while holding ``lease``, so one instance runs it at a
+    time. The others wait and take over when the holder stops or dies.
+    """
+    while True:
+        if await lease.acquire():
+            try:
+                async with lease.holding():
+                    await factory()
+                return
+            except LeaseLostError as e:
+                logging.warning(f"{e}, waiting to take it over again")
+        await asyncio.sleep(lease.poll_interval)
+
+
+def create_supervisor(
+    db_news: AsyncCollection,
+    db_timeline: AsyncCollection,
+    cadence: ScrapeCadence = None,
+    watcher: ReleaseWatcher = None,
+    backfill_interval: timedelta = timedelta(hours=6),
+    lease_collection: AsyncCollection = None,
+    backfill_source_timeout: float = SOURCE_TIMEOUT * 5,
+    on_countdown: Optional[Callable[[News, str], Awaitable[None]]] = None,
+) -> Supervisor:
+    """
+    Supervisor for the scraper daemon with three independent services:
+
+    - ``calendar``: refreshes the calendar around now on an adaptive cadence.
+    - ``backfill``: refreshes the full calendar range and its timelines.
+    - ``watcher``: polls for actuals at release time.
+
+    With ``on_countdown`` a fourth service, ``countdown``, awaits
+    ``on_countdown(news, label)`` at each ``RELEASE_OFFSETS`` label before the
+    scraped releases, e.g. to post the messages ``edit_or_send`` replaces.
+
+    With ``lease_collection`` the backfill, the watcher and the countdown each
+    run on a single instance at a time, under leases of the same name. Gate the
+    calendar scrape with ``set_scrape_lease``.
+
+    A calendar source that takes longer than ``backfill_source_timeout``
+    seconds over the full range is skipped by that backfill run.
+    """
+    cadence = cadence or ScrapeCadence()
+    watcher = watcher or ReleaseWatcher(db_news)
+    countdown = EventScheduler(on_countdown) if on_countdown else None
+    backfill_lease = watcher_lease = countdown_lease = None
+    if lease_collection is not None:
+        backfill_lease = MongoLease(lease_collection, "backfill", poll_interval=10)
+        watcher_lease = MongoLease(lease_collection, "watcher", poll_interval=10)
+        countdown_lease = MongoLease(lease_collection, "countdown", poll_interval=10)
+
+    async def scrape() -> list[News]:
+        newses = await scrap_with_lock(db_news, db_timeline)
+        # only the instance running the watcher polls for releases
+        if watcher_lease is None or watcher_lease.held:
+            watcher.watch(newses)
+        # cheap to keep on every instance, it only fires while run holds the lease
+        if countdown:
+            countdown.load(newses)
+        return newses
+
+    async def refresh_calendar():
+        await cadence.run(scrape)
+
+    async def backfill():
+        while True:
+            # leave scraper threads free for the calendar refresh
+            await update_forexfactory_calendar(
+                db_news,
+                db_timeline,
+                calendar_concurrency=2,
+                timeline_concurrency=2,
+                source_timeout=backfill_source_timeout,
+            )
+            await asyncio.sleep(backfill_interval.total_seconds())
+
+    watch = watcher.run
+    if backfill_lease:
+        backfill = partial(run_leased, backfill_lease, backfill)
+    if watcher_lease:
+        watch = partial(run_leased, watcher_lease, watch)
+
+    services = [
+        Service("calendar", refresh_calendar, restart="always"),
+        Service("backfill", backfill, restart="always", backoff=60),
+        Service("watcher", watch, restart="always"),
+    ]
+    if countdown:
+        run_countdown = countdown.run
+        if countdown_lease:
+            run_countdown = partial(run_leased, countdown_lease, run_countdown)
+        services.append(Service("countdown", run_countdown, restart="always"))
+    return Supervisor(services)
+
+
+async def run_daemon(supervisor: Supervisor):
+    """Run ``supervisor`` until SIGINT or SIGTERM."""
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, supervisor.stop)
+        except NotImplementedError:
+            # Windows event loops do not support signal handlers
+            pass
+
+    await supervisor.run()
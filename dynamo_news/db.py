@@ -1,8 +1,13 @@
-from typing import Optional
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Optional, Union
 
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
 from pymongo.asynchronous.collection import AsyncCollection
 
-from dynamo_news.models import ForexFactory
+from dynamo_news.models import ForexFactory, News
 
 
 async def get_forexfactory_trade_events(
@@ -17,3 +22,102 @@ async def get_forexfactory_trade_event(
     r = await db_trade_event.find_one({"event_name": event_name, "currency": currency})
     if r:
         return ForexFactory(**r)
+
+
+async def get_news_between(
+    db_news: AsyncCollection, start_date: datetime, end_date: datetime
+) -> list[News]:
+    """Stored news between two dates, latest first."""
+    newses = []
+    async for x in db_news.find(
+        {"event_time": {"$gte": start_date, "$lte": end_date}}
+    ).sort("event_time", -1):
+        try:
+            newses.append(News(**x))
+        except Exception as e:
+            logging.debug(f"Skipping stored news {x.get('event_id')}: {e}")
+    return newses
+
+
+class BulkWriter:
+    """
+    Buffer write operations for a collection and send them as unordered bulk writes.
+
+    The buffer is flushed once it holds ``batch_size`` operations or when
+    ``flush_interval`` seconds have passed since the last flush. Use it as an
+    async context manager so the remaining operations are flushed on exit.
+
+    A failing batch is logged and recorded in ``failed`` as
+    ``(batch_number, operation_count, error)`` instead of raising, so it never
+    fails the ``add`` call of an unrelated operation that triggered the flush.
+    ``on_flush`` callbacks passed to ``add`` are called with whether the batch
+    holding their operation was written.
+    """
+
+    def __init__(
+        self,
+        collection: AsyncCollection,
+        batch_size: int = 100,
+        flush_interval: float = 5,
+    ):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.batches = 0
+        self.failed: list[tuple[int, int, Exception]] = []
+        self._operations = []
+        self._callbacks: list[Callable[[bool], None]] = []
+        self._flushed_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def add(
+        self,
+        operation: Union[
+            InsertOne, UpdateOne, UpdateMany, ReplaceOne, DeleteOne, DeleteMany
+        ],
+        on_flush: Callable[[bool], None] = None,
+    ):
+        self._operations.append(operation)
+        if on_flush:
+            self._callbacks.append(on_flush)
+        if (
+            len(self._operations) >= self.batch_size
+            or time.monotonic() - self._flushed_at >= self.flush_interval
+        ):
+            await self.flush()
+
+    async def flush(self) -> bool:
+        """Send the buffered operations. Returns False when the batch failed."""
+        async with self._lock:
+            self._flushed_at = time.monotonic()
+            if not self._operations:
+                return True
+            operations, self._operations = self._operations, []
+            callbacks, self._callbacks = self._callbacks, []
+            self.batches += 1
+            try:
+                await self.collection.bulk_write(operations, ordered=False)
+                ok = True
+                self.written += len(operations)
+            except Exception as e:
+                logging.exception(
+                    f"Error in bulk write batch {self.batches} "
+                    f"({len(operations)} operations) to {self.collection.full_name}",
+                    exc_info=e,
+                )
+                self.failed.append((self.batches, len(operations), e))
+                ok = False
+
+            for callback in callbacks:
+                try:
+                    callback(ok)
+                except Exception as e:
+                    logging.exception("Error in bulk write callback", exc_info=e)
+            return ok
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.flush()
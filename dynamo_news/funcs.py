@@ -1,10 +1,29 @@
 import re
+import sys
+from functools import lru_cache
+
+from dynamo_news.constant import IMPACT_RATING
+
+SPECIAL_CHARS_PATTERN = re.compile("[,%kmbt<>\b]", flags=re.IGNORECASE)
+X_X_PATTERN = re.compile(r"\b\w/\w\b")
 
 
 def remove_special_chars(v: str) -> str:
-    return re.sub("[,%kmbt<>\b]", "", v, flags=re.IGNORECASE)
+    return SPECIAL_CHARS_PATTERN.sub("", v)
 
 
 def replace_x_x(match):
     letter = match.group()[0].upper()
     return f"({letter}o{letter})"
+
+
+@lru_cache(maxsize=2048)
+def normalize_event_name(name: str) -> str:
+    """Spell out period abbreviations, e.g. ``CPI m/m`` -> ``CPI (MoM)``."""
+    return sys.intern(X_X_PATTERN.sub(replace_x_x, name))
+
+
+def impact_rating(impact_title: str) -> int:
+    if (rating := IMPACT_RATING.get(impact_title)) is not None:
+        return rating
+    return 3 if "High" in impact_title else 2 if "Medium" in impact_title else 1
@@ -1,56 +1,387 @@
 import asyncio
-from typing import Union, Any
-from urllib.parse import urlencode
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import partial
+from json import dumps
+from typing import Union, Any, AsyncIterator, Callable, Hashable, Iterator
+from urllib.parse import urlencode, urlsplit
 
 import httpx
 import cloudscraper
+from pydantic import BaseModel
 
-http = httpx.AsyncClient()
+from dynamo_news.aio import CircuitBreaker, SingleFlight
+from dynamo_news.cache import ConditionalCache, ResponseCache
+from dynamo_news.codec import ACCEPT_ENCODING, loads
+from dynamo_news.metrics import metrics
+from dynamo_news.retry import RetryBudget, RetryPolicy
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HTTPConfig(BaseModel):
+    """
+    Settings of the shared ``httpx`` client.
+
+    ``host_timeouts`` overrides the read timeout, in seconds, for the hosts it
+    lists, e.g. ``{"207.180.195.191:22030": 30}``.
+    """
+
+    http2: bool = True
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30
+    connect_timeout: float = 5
+    timeout: float = 15
+    host_timeouts: dict[str, float] = {}
+
+
+def create_client(config: HTTPConfig) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        # HTTP/2 needs the h2 package and is only negotiated over TLS
+        http2=config.http2 and HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+    )
+
+
+http_config = HTTPConfig()
+_client = create_client(http_config)
+# client -> requests in flight on it, a replaced client is closed at zero
+_in_flight: dict[httpx.AsyncClient, int] = {}
+_retired: set[httpx.AsyncClient] = set()
+# shared by every get_http/post_http call so the budget is global
+retry_policy = RetryPolicy(budget=RetryBudget())
+conditional_cache = ConditionalCache(maxsize=2048)
+# used by get_http(cache=True)
+response_cache = ResponseCache(maxsize=2048, ttl=5, stale_ttl=30)
+# identical requests in flight share one call
+http_flight = SingleFlight()
+# cache key -> background refresh of a stale response_cache entry
+_revalidations: dict[Hashable, asyncio.Task] = {}
 scraper = cloudscraper.create_scraper(
     browser={"browser": "chrome", "platform": "windows", "mobile": True}
 )
 
 
-async def fetch_url_async(u: str, return_json: bool = True):
-    loop = asyncio.get_event_loop()
-    r = await loop.run_in_executor(None, scraper.get, u)
-    return r.json() if return_json else r.text
+# cloudscraper is blocking, so every call to it runs on this pool
+scraper_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="scraper")
+# reserved for release-time polls, so background scrapes cannot queue them
+release_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="release")
+# pool the scraper calls of the current task run on, see ``use_scraper_pool``
+current_executor: ContextVar[ThreadPoolExecutor] = ContextVar(
+    "current_executor", default=scraper_executor
+)
+SCRAPER_TIMEOUT = 60
+# statuses Cloudflare answers with when a challenge fails or we are throttled
+BLOCKED_STATUS_CODES = {403, 429, 503}
+# host -> circuit breaker guarding the scraper calls to it
+scraper_breakers: dict[str, CircuitBreaker] = {}
 
 
-async def get_http(
-    url: str, params: dict[str, str] = None, api_key: str = None
-) -> Union[dict, list]:
+@contextmanager
+def use_scraper_pool(executor: ThreadPoolExecutor) -> Iterator[None]:
+    """Run the scraper calls made in the block, and in tasks it starts, on
+    ``executor`` instead of ``scraper_executor``."""
+    token = current_executor.set(executor)
+    try:
+        yield
+    finally:
+        current_executor.reset(token)
+
+
+def __getattr__(name: str):
+    # ``http`` is looked up on access so it follows ``configure_http``
+    if name == "http":
+        return _client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_client() -> httpx.AsyncClient:
+    """The shared client, prefer it over importing ``http`` directly."""
+    return _client
+
+
+async def configure_http(config: HTTPConfig):
+    """
+    Replace the shared client with one built from ``config``. The old client
+    is closed once the requests in flight on it have finished.
+    """
+    global _client, http_config
+    old = _client
+    http_config = config
+    _client = create_client(config)
+    if _in_flight.get(old):
+        _retired.add(old)
+    else:
+        await old.aclose()
+
+
+@asynccontextmanager
+async def _borrow_client() -> AsyncIterator[httpx.AsyncClient]:
+    client = _client
+    _in_flight[client] = _in_flight.get(client, 0) + 1
+    try:
+        yield client
+    finally:
+        _in_flight[client] -= 1
+        if not _in_flight[client]:
+            del _in_flight[client]
+            if client in _retired:
+                _retired.discard(client)
+                await client.aclose()
+
+
+async def _request(method: str, url: str, **kwargs) -> httpx.Response:
+    async with _borrow_client() as client:
+        return await client.request(method, url, **kwargs)
+
+
+def request_timeout(url: str) -> httpx.Timeout:
+    host = urlsplit(url).netloc
+    return httpx.Timeout(
+        http_config.host_timeouts.get(host, http_config.timeout),
+        connect=http_config.connect_timeout,
+    )
+
+
+def get_scraper_breaker(url: str) -> CircuitBreaker:
+    host = urlsplit(url).netloc
+    if host not in scraper_breakers:
+        scraper_breakers[host] = CircuitBreaker(host)
+    return scraper_breakers[host]
+
+
+async def run_scraper(
+    func: Callable, url: str, *args, timeout: float = SCRAPER_TIMEOUT, **kwargs
+):
+    """
+    Run a blocking ``scraper`` call for ``url`` on ``scraper_executor``, or the
+    pool set with ``use_scraper_pool``, without blocking the loop.
+
+    ``timeout`` is passed to requests and also bounds the wait with
+    ``asyncio.wait_for``. On timeout or cancellation the caller returns at
+    once while the worker thread finishes its request in the background.
+
+    Calls go through the circuit breaker of the url's host: errors and
+    ``BLOCKED_STATUS_CODES`` count as failures, and while the circuit is open
+    the call fails fast with ``CircuitOpenError``.
+    """
+    kwargs.setdefault("timeout", timeout)
+
+    async def call():
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            current_executor.get(), partial(func, url, *args, **kwargs)
+        )
+        r = await asyncio.wait_for(future, timeout=timeout)
+        if r.status_code in BLOCKED_STATUS_CODES:
+            r.raise_for_status()
+        return r
+
+    return await get_scraper_breaker(url).call(call)
+
+
+def _scraper_get(u: str, timeout: float):
+    r = scraper.get(u, headers=conditional_cache.validators(u), timeout=timeout)
+    r = conditional_cache.resolve(u, r)
+    if r.status_code == 304:
+        # the cached copy was evicted while we revalidated it
+        r = conditional_cache.resolve(u, scraper.get(u, timeout=timeout))
+    return r
+
+
+async def fetch_url_async(
+    u: str, return_json: bool = True, timeout: float = SCRAPER_TIMEOUT
+):
+    r = await run_scraper(_scraper_get, u, timeout=timeout)
+    return loads(r.content) if return_json else r.text
+
+
+async def conditional_get(
+    url: str, headers: dict[str, str] = None, cache_key: Any = None
+) -> httpx.Response:
+    """
+    GET ``url`` with ``If-None-Match``/``If-Modified-Since`` validators from
+    ``conditional_cache`` and serve the cached response on a 304. When the
+    cached response is gone by then, ``url`` is fetched again in full.
+    """
+    cache_key = cache_key or url
+    validators = conditional_cache.validators(cache_key)
+
+    async def get(validators: dict[str, str]) -> httpx.Response:
+        response = await retry_policy.send(
+            "GET",
+            lambda: _request(
+                "GET",
+                url,
+                headers={**(headers or {}), **validators},
+                timeout=request_timeout(url),
+            ),
+        )
+        return conditional_cache.resolve(cache_key, response)
+
+    response = await get(validators)
+    if validators and response.status_code == 304:
+        # the cached copy was evicted or invalidated while we revalidated it
+        response = await get({})
+    return response
+
+
+async def post_url_async(
+    u: str,
+    data: Union[dict, str] = None,
+    timeout: float = SCRAPER_TIMEOUT,
+    headers: dict[str, str] = None,
+):
+    with metrics.stage("scraper_post"):
+        r = await run_scraper(
+            scraper.post, u, data=data, headers=headers, timeout=timeout
+        )
+    r.raise_for_status()
+
+    # decode in the worker thread too, calendar responses are large
+    with metrics.stage("json_decode", count=len(r.content)):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(current_executor.get(), loads, r.content)
+
+
+def _encode_url(url: str, params: dict[str, str] = None) -> str:
     if params:
         params = {k: v for k, v in params.items() if v is not None}
         encoded_params = urlencode(params)
         url = f"{url}?{encoded_params}"
-    # try zstd or gzip compression
-    headers = {"Accept-Encoding": "gzip"}
+    return url
+
+
+async def _get(url: str, api_key: str = None) -> bytes:
+    # concurrent callers share the body, bytes are safe to share
+    return await http_flight.do(("GET", url, api_key), _fetch, url, api_key)
+
+
+async def _fetch(url: str, api_key: str = None) -> bytes:
+    headers = {"Accept-Encoding": ACCEPT_ENCODING}
     if api_key:
         headers["X-API-KEY"] = api_key
-    response = await http.get(url, headers=headers)
+    response = await conditional_get(url, headers=headers, cache_key=(url, api_key))
     response.raise_for_status()
-    return response.json()
+    return response.content
 
 
-async def post_http(
+async def _revalidate(url: str, api_key: str = None):
+    key = (url, api_key)
+    try:
+        response_cache.set(key, await _get(url, api_key))
+    except Exception as e:
+        logging.warning(f"Error in revalidating {url}: {e}")
+    finally:
+        _revalidations.pop(key, None)
+
+
+async def get_http(
     url: str,
     params: dict[str, str] = None,
+    api_key: str = None,
+    cache: bool = False,
+    raw: bool = False,
+) -> Union[dict, list, bytes]:
+    """
+    GET ``url`` as JSON, or as the raw body with ``raw`` (e.g. for pydantic's
+    ``model_validate_json``). With ``cache`` the body is served from
+    ``response_cache``; a stale entry is returned at once and refreshed in the
+    background.
+    """
+    url = _encode_url(url, params)
+    key = (url, api_key)
+    cached = response_cache.lookup(key) if cache else None
+    if cached is not None:
+        content, fresh = cached
+        if not fresh and key not in _revalidations:
+            _revalidations[key] = asyncio.create_task(_revalidate(url, api_key))
+    else:
+        content = await _get(url, api_key)
+        if cache:
+            response_cache.set(key, content)
+    return content if raw else loads(content)
+
+
+def invalidate_http_cache(url: str, params: dict[str, str] = None, api_key: str = None):
+    """Drop the cached ``get_http`` response for these arguments."""
+    key = (_encode_url(url, params), api_key)
+    response_cache.invalidate(key)
+    conditional_cache.invalidate(key)
+
+
+async def _post(
+    url: str,
     data: Union[dict, str] = None,
     json: Union[dict, str] = None,
     api_key: str = None,
-) -> Union[Any]:
-    if params:
-        params = {k: v for k, v in params.items() if v is not None}
-        encoded_params = urlencode(params)
-        url = f"{url}?{encoded_params}"
-    headers = {"Content-Type": "application/json"}
+    idempotent: bool = False,
+) -> bytes:
+    headers = {"Content-Type": "application/json", "Accept-Encoding": ACCEPT_ENCODING}
 
     if api_key:
         headers["X-API-KEY"] = api_key
-    response = await http.post(url, data=data, json=json, headers=headers)
+    response = await retry_policy.send(
+        "POST",
+        lambda: _request(
+            "POST",
+            url,
+            data=data,
+            json=json,
+            headers=headers,
+            timeout=request_timeout(url),
+        ),
+        idempotent=idempotent,
+    )
     response.raise_for_status()
+    return response.content
+
+
+async def post_http(
+    url: str,
+    params: dict[str, str] = None,
+    data: Union[dict, str] = None,
+    json: Union[dict, str] = None,
+    api_key: str = None,
+    idempotent: bool = False,
+    coalesce: bool = False,
+    raw: bool = False,
+) -> Union[Any]:
+    """
+    POST to ``url``. Pass ``idempotent=True`` for read-only endpoints so the
+    request is retried like a GET, and ``coalesce=True`` to share one request
+    between concurrent calls with the same url, api key and body. With ``raw``
+    the body is returned as bytes instead of decoded JSON.
+    """
+    url = _encode_url(url, params)
+    if not coalesce:
+        content = await _post(url, data, json, api_key, idempotent)
+    else:
+        key = (
+            "POST",
+            url,
+            api_key,
+            dumps(data, sort_keys=True, default=str),
+            dumps(json, sort_keys=True, default=str),
+        )
+        content = await http_flight.do(key, _post, url, data, json, api_key, idempotent)
+
+    if raw:
+        return content
     try:
-        return response.json()
+        return loads(content)
     except Exception:  # noqa
         return None
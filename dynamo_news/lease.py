@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
+
+import pytz
+from pymongo import ReturnDocument
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import DuplicateKeyError
+
+
+class LeaseLostError(Exception):
+    def __init__(self, name: str):
+        super().__init__(f"Lease '{name}' was lost")
+        self.name = name
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # pymongo returns naive datetimes unless the client is tz_aware
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=pytz.UTC)
+    return value
+
+
+class MongoLease:
+    """
+    Lease stored as one document in ``collection``, shared by every instance.
+
+    The document holds the ``owner``, the ``expires_at`` time and a ``token``
+    that increases on every acquisition. A holder that crashes stops renewing,
+    so its lease expires after ``ttl`` and another instance takes over.
+    Renewal and release only match the owner and token that acquired the
+    lease, so a holder that lost it cannot extend or free the new holder's.
+    Writes are not checked against the token; ``holding`` instead cancels its
+    block as soon as the lease is lost.
+
+    Expiry uses the local clocks, keep the instances in sync and ``ttl`` well
+    above the expected skew.
+    """
+
+    def __init__(
+        self,
+        collection: AsyncCollection,
+        name: str,
+        ttl: timedelta = timedelta(seconds=60),
+        owner: str = None,
+        poll_interval: float = 1,
+    ):
+        self.collection = collection
+        self.name = name
+        self.ttl = ttl
+        self.owner = owner or default_owner()
+        self.poll_interval = poll_interval
+        self.token: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self.token is not None
+
+    async def acquire(self) -> bool:
+        """Take the lease if it is free, expired or already ours."""
+        now = datetime.now(pytz.UTC)
+        try:
+            doc = await self.collection.find_one_and_update(
+                {
+                    "_id": self.name,
+                    "$or": [
+                        {"owner": None},
+                        {"owner": self.owner},
+                        {"expires_at": {"$lte": now}},
+                    ],
+                },
+                {
+                    "$set": {"owner": self.owner, "expires_at": now + self.ttl},
+                    "$inc": {"token": 1},
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # held by another instance, the upsert collided with its document
+            return False
+
+        if doc is None:
+            return False
+        if self.token is None and doc.get("owner") == self.owner:
+            logging.info(f"Acquired lease {self.name} (token {doc['token']})")
+        self.token = doc["token"]
+        return True
+
+    async def renew(self) -> bool:
+        """Extend the lease. Returns False, and drops it, when it was lost."""
+        if self.token is None:
+            return False
+        result = await self.collection.update_one(
+            {"_id": self.name, "owner": self.owner, "token": self.token},
+            {"$set": {"expires_at": datetime.now(pytz.UTC) + self.ttl}},
+        )
+        if result.matched_count == 0:
+            logging.warning(f"Lost lease {self.name} (token {self.token})")
+            self.token = None
+            return False
+        return True
+
+    async def release(self, completed: bool = False):
+        """
+        Free the lease. With ``completed`` the release time is recorded as
+        ``completed_at`` for ``last_completed``.
+        """
+        if self.token is None:
+            return
+        update = {"owner": None, "expires_at": datetime.now(pytz.UTC)}
+        if completed:
+            update["completed_at"] = update["expires_at"]
+        await self.collection.update_one(
+            {"_id": self.name, "owner": self.owner, "token": self.token},
+            {"$set": update},
+        )
+        self.token = None
+
+    async def last_completed(self) -> Optional[datetime]:
+        doc = await self.collection.find_one({"_id": self.name}, {"completed_at": 1})
+        return _as_utc(doc.get("completed_at")) if doc else None
+
+    @asynccontextmanager
+    async def holding(self) -> AsyncIterator["MongoLease"]:
+        """
+        Keep an acquired lease renewed for the duration of the block, then
+        release it, recording a completion when the block succeeded.
+
+        When the lease is lost, or cannot be renewed before it expires, the
+        block is cancelled and ``LeaseLostError`` is raised so the work stops
+        before another holder takes over.
+        """
+        task = asyncio.current_task()
+        lost = finished = False
+
+        async def renew_forever():
+            nonlocal lost
+            renewed_at = time.monotonic()
+            while True:
+                await asyncio.sleep(self.ttl.total_seconds() / 3)
+                try:
+                    if not await self.renew():
+                        break
+                    renewed_at = time.monotonic()
+                except Exception as e:
+                    logging.exception(
+                        f"Error in renewing lease {self.name}", exc_info=e
+                    )
+                    # give up before the next attempt would come too late
+                    expiry = self.ttl.total_seconds() * 2 / 3
+                    if time.monotonic() - renewed_at >= expiry:
+                        self.token = None
+                        break
+            lost = True
+            if not finished:
+                task.cancel()
+
+        renewal = asyncio.create_task(renew_forever())
+        completed = False
+        try:
+            yield self
+            completed = True
+        except asyncio.CancelledError:
+            if lost and task.uncancel() == 0:
+                raise LeaseLostError(self.name) from None
+            raise
+        finally:
+            finished = True
+            renewal.cancel()
+            await asyncio.gather(renewal, return_exceptions=True)
+            await self.release(completed=completed)
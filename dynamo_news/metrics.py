@@ -0,0 +1,67 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+StageHook = Callable[[str, float, int], None]
+
+
+class Stage:
+    def __init__(self, name: str, count: int = 0):
+        self.name = name
+        self.count = count
+
+
+class Metrics:
+    """
+    Registry that reports how long each pipeline stage took.
+
+    Every observation is passed to the registered hooks as
+    ``hook(stage, duration_seconds, item_count)`` and the latest one per stage
+    is kept in ``last``. A failing hook is logged and never breaks the caller.
+
+    Events that have no duration, like retries, are counted in ``counters``.
+    """
+
+    def __init__(self):
+        self.hooks: list[StageHook] = []
+        self.last: dict[str, tuple[float, int]] = {}
+        self.counters: dict[str, int] = {}
+
+    def incr(self, counter: str, value: int = 1):
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def add_hook(self, hook: StageHook):
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: StageHook):
+        self.hooks.remove(hook)
+
+    def observe(self, stage: str, duration: float, count: int = 0):
+        self.last[stage] = (duration, count)
+        for hook in self.hooks:
+            try:
+                hook(stage, duration, count)
+            except Exception as e:
+                logging.exception(f"Error in metrics hook for {stage}", exc_info=e)
+
+    @contextmanager
+    def stage(self, name: str, count: int = 0) -> Iterator[Stage]:
+        """
+        Time the block as stage ``name``. Set ``.count`` on the yielded object
+        when the item count is only known at the end.
+        """
+        stage = Stage(name, count)
+        started_at = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            self.observe(stage.name, time.perf_counter() - started_at, stage.count)
+
+
+def log_stage(stage: str, duration: float, count: int):
+    """Hook that logs every stage, e.g. ``metrics.add_hook(log_stage)``."""
+    logging.info(f"{stage}: {count} items in {duration:.3f}s")
+
+
+metrics = Metrics()
@@ -3,7 +3,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Union, Optional
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, field_validator, model_validator
 from pydantic import Field
 
 from dynamo_news.constant import TZ
@@ -25,6 +25,15 @@ class News(BaseModel):
     soloUrl: str
     ebase_id: int
     hasGraph: bool
+    # whether the actual is out, ``to_float`` turns a missing one into 0 too
+    released: bool = Field(default=False, exclude=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def mark_released(cls, data):
+        if isinstance(data, dict) and "released" not in data:
+            data = {**data, "released": data.get("actual") not in (None, "")}
+        return data
 
     @field_validator("event_time")
     def astimezone(cls, v):
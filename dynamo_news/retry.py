@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from dynamo_news.metrics import metrics
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# statuses worth another attempt, the server is overloaded or restarting
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+class RetryBudget:
+    """
+    Cap retries at ``ratio`` of the requests made in the last ``window``
+    seconds, with at least ``min_retries`` allowed, so an outage does not turn
+    every request into ``max_attempts`` requests.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, window: float = 10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+
+    def _expire(self, now: float):
+        for times in (self._requests, self._retries):
+            while times and times[0] < now - self.window:
+                times.popleft()
+
+    def record_request(self):
+        self._requests.append(time.monotonic())
+
+    def try_retry(self) -> bool:
+        """Spend one retry from the budget, False when it is exhausted."""
+        now = time.monotonic()
+        self._expire(now)
+        if len(self._retries) >= max(
+            self.min_retries, self.ratio * len(self._requests)
+        ):
+            return False
+        self._retries.append(now)
+        return True
+
+
+class RetryPolicy:
+    """
+    Retry idempotent requests on transport errors and ``status_codes`` with
+    exponential backoff and full jitter, honouring ``Retry-After``.
+
+    Attempts, retries and give-ups are counted in ``metrics.counters`` as
+    ``http_attempts``, ``http_retries`` and ``http_give_ups``.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 5,
+        status_codes: frozenset[int] = RETRY_STATUS_CODES,
+        budget: Optional[RetryBudget] = None,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.status_codes = status_codes
+        self.budget = budget
+
+    def backoff(self, attempt: int, response: httpx.Response = None) -> float:
+        retry_after = response.headers.get("Retry-After") if response else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    async def send(
+        self,
+        method: str,
+        request: Callable[[], Awaitable[httpx.Response]],
+        idempotent: bool = None,
+    ) -> httpx.Response:
+        """
+        Call ``request`` until it succeeds or the attempts or budget run out.
+        The last response is returned, or the last error raised, as is.
+        ``idempotent`` defaults to whether ``method`` is idempotent.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempts = self.max_attempts if idempotent else 1
+
+        for attempt in range(attempts):
+            metrics.incr("http_attempts")
+            if self.budget:
+                self.budget.record_request()
+
+            response = error = None
+            try:
+                response = await request()
+            except httpx.TransportError as e:
+                error = e
+            if response is not None and response.status_code not in self.status_codes:
+                return response
+
+            if attempt + 1 == attempts:
+                break
+            if self.budget and not self.budget.try_retry():
+                logging.warning("Retry budget exhausted, not retrying")
+                break
+
+            metrics.incr("http_retries")
+            delay = self.backoff(attempt, response)
+            logging.debug(
+                f"Retrying {method} in {delay:.2f}s: {error or response.status_code}"
+            )
+            await asyncio.sleep(delay)
+
+        if attempts > 1:
+            metrics.incr("http_give_ups")
+        if error:
+            raise error
+        return response
@@ -0,0 +1,111 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional, Union
+
+import pytz
+
+from dynamo_news.constant import RELEASE_OFFSETS
+from dynamo_news.models import News
+
+
+class EventScheduler:
+    """
+    Fire callbacks at fixed offsets before each scheduled event's ``event_time``.
+
+    Pending firings are kept in a min-heap ordered by fire time, so scheduling
+    and rescheduling are O(log n). Rescheduled or cancelled firings are marked
+    removed and skipped when they reach the top of the heap. ``run`` sleeps
+    until the next firing instead of polling and wakes early when an earlier
+    one is scheduled.
+
+    Parameters:
+        callback: Awaited with ``(news, label)`` when a firing is due.
+        offsets (dict[str, timedelta]): Label -> time before event_time to fire.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[News, str], Awaitable[None]],
+        offsets: dict[str, timedelta] = None,
+    ):
+        self.callback = callback
+        self.offsets = offsets or RELEASE_OFFSETS
+        self._heap: list[list] = []
+        self._entries: dict[tuple[Union[int, str], str], list] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._firing: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def schedule(self, news: News):
+        """Schedule ``news``, moving its firings if its event_time changed."""
+        now = datetime.now(pytz.UTC)
+        for label, offset in self.offsets.items():
+            key = (news.event_id, label)
+            fire_at = news.event_time - offset
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == fire_at:
+                    entry[3] = news
+                    continue
+                self._remove(key)
+            if fire_at <= now:
+                continue
+
+            entry = [fire_at, next(self._counter), key, news]
+            self._entries[key] = entry
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                self._wakeup.set()
+
+    def load(self, newses: list[News]):
+        for news in newses:
+            self.schedule(news)
+
+    def cancel(self, event_id: Union[int, str]):
+        for label in self.offsets:
+            self._remove((event_id, label))
+
+    def _remove(self, key: tuple[Union[int, str], str]):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry[3] = None
+
+    def next_fire_at(self) -> Optional[datetime]:
+        while self._heap and self._heap[0][3] is None:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    async def run(self):
+        while True:
+            self._wakeup.clear()
+            fire_at = self.next_fire_at()
+            timeout = (
+                None
+                if fire_at is None
+                else (fire_at - datetime.now(pytz.UTC)).total_seconds()
+            )
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            fire_at, _, key, news = heapq.heappop(self._heap)
+            del self._entries[key]
+            # run callbacks as tasks so a slow one does not delay the next firing
+            task = asyncio.create_task(self._fire(news, key[1]))
+            self._firing.add(task)
+            task.add_done_callback(self._firing.discard)
+
+    async def _fire(self, news: News, label: str):
+        try:
+            await self.callback(news, label)
+        except Exception as e:
+            logging.exception(f"Error in scheduler callback '{label}'", exc_info=e)
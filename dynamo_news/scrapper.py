@@ -1,44 +1,166 @@
 import asyncio
+import hashlib
 import json
 import logging
-import re
+import sys
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Union
 
 import pytz
+from cachetools import LRUCache
 from dateutil.relativedelta import relativedelta
 from pymongo import UpdateOne
 from pymongo.asynchronous.collection import AsyncCollection
 
-from dynamo_news.constant import TZ
-from dynamo_news.funcs import replace_x_x
-from dynamo_news.http import fetch_url_async, http, scraper
-from dynamo_news.models import ForexFactory, News
+from dynamo_news.aio import CircuitOpenError, SingleFlight, TokenBucket
+from dynamo_news.archive import ScrapeArchive
+from dynamo_news.constant import FOREX_FACTORY_CURRENCIES, TZ
+from dynamo_news.db import BulkWriter, get_news_between
+from dynamo_news.funcs import impact_rating, normalize_event_name
+from dynamo_news.http import (
+    SCRAPER_TIMEOUT,
+    conditional_get,
+    fetch_url_async,
+    post_url_async,
+)
+from dynamo_news.lease import LeaseLostError, MongoLease
+from dynamo_news.metrics import metrics
+from dynamo_news.models import ForexFactory, News, NewsSource
+from dynamo_news.sources import CalendarSource
 
 lock = asyncio.Lock()
+scrape_flight = SingleFlight()
+# (collection, event_id) -> fingerprint of the last document written
+news_fingerprints = LRUCache(maxsize=50_000)
+# (collection, ebase_id) -> {"fetched_at": datetime, "last_actual": [event_id, actual]}
+timeline_freshness = LRUCache(maxsize=10_000)
+# (collection, ebase_id) -> {"high_water": newest point key, "tail": {key: point}}
+timeline_tails = LRUCache(maxsize=10_000)
+TIMELINE_LIMIT = 200
+TIMELINE_POINT_KEY = "dateline"
+TIMELINE_TAIL = 12
+# when set, raw payloads are archived to (or replayed from) disk
+scrape_archive: Optional[ScrapeArchive] = None
+# sources used when a calendar update is not given any
+calendar_sources: Optional[list[CalendarSource]] = None
+# when set, only the instance holding this lease scrapes in scrap_with_lock
+scrape_lease: Optional[MongoLease] = None
+# a scrape finished by another instance this recently is served from the db
+SCRAPE_FRESHNESS = timedelta(seconds=30)
+# a calendar source slower than this is skipped, so it cannot stall the others
+SOURCE_TIMEOUT = SCRAPER_TIMEOUT * 2
 
 
-async def scrap_with_lock(db_news: AsyncCollection, db_timeline: AsyncCollection):
-    if lock.locked():
-        while lock.locked():
-            await asyncio.sleep(5)
-        return
+def set_scrape_archive(archive: Optional[ScrapeArchive]):
+    global scrape_archive
+    scrape_archive = archive
 
-    async with lock:
-        await update_forexfactory_calendar(
+
+def is_replaying() -> bool:
+    return scrape_archive is not None and scrape_archive.replay
+
+
+def set_calendar_sources(sources: Optional[list[CalendarSource]]):
+    global calendar_sources
+    calendar_sources = sources
+
+
+def set_scrape_lease(lease: Optional[MongoLease]):
+    global scrape_lease
+    scrape_lease = lease
+
+
+async def scrap_with_lock(
+    db_news: AsyncCollection, db_timeline: AsyncCollection
+) -> list[News]:
+    """
+    Scrape the calendar around now. Concurrent callers share the scrape that is
+    already in flight and all receive its result.
+    """
+    return await scrape_flight.do(
+        (db_news.full_name, db_timeline.full_name), _scrap, db_news, db_timeline
+    )
+
+
+async def _scrap(db_news: AsyncCollection, db_timeline: AsyncCollection) -> list[News]:
+    with metrics.stage("lock_wait"):
+        await lock.acquire()
+    try:
+        if scrape_lease is None:
+            return await _scrap_around_now(db_news, db_timeline)
+        return await _scrap_with_lease(db_news, db_timeline)
+    finally:
+        lock.release()
+
+
+async def _scrap_around_now(
+    db_news: AsyncCollection, db_timeline: AsyncCollection
+) -> list[News]:
+    with metrics.stage("scrap_with_lock") as stage:
+        newses = await update_forexfactory_calendar(
             db_news=db_news,
             db_timeline=db_timeline,
             return_early=True,
             start_date=datetime.now(TZ) - timedelta(days=1),
             end_date=datetime.now(TZ) + timedelta(days=1),
         )
+        stage.count = len(newses)
+        return newses
+
+
+async def _scrap_with_lease(
+    db_news: AsyncCollection,
+    db_timeline: AsyncCollection,
+    max_wait: float = SCRAPER_TIMEOUT * 2,
+) -> list[News]:
+    """
+    Scrape only while holding ``scrape_lease``. Other instances wait for the
+    holder to finish and read its results from ``db_news``, or take over the
+    lease when the holder stops renewing it.
+    """
+    requested_at = datetime.now(pytz.UTC)
+    deadline = time.monotonic() + max_wait
+    with metrics.stage("lease_wait"):
+        while True:
+            completed_at = await scrape_lease.last_completed()
+            if completed_at and completed_at >= requested_at - SCRAPE_FRESHNESS:
+                break
+            if await scrape_lease.acquire():
+                try:
+                    async with scrape_lease.holding():
+                        return await _scrap_around_now(db_news, db_timeline)
+                except LeaseLostError as e:
+                    logging.warning(f"{e} while scraping, serving stored news")
+                    break
+            if time.monotonic() > deadline:
+                logging.warning(
+                    f"Lease {scrape_lease.name} still held after {max_wait}s, "
+                    "serving stored news"
+                )
+                break
+            await asyncio.sleep(scrape_lease.poll_interval)
+
+    return await get_news_between(
+        db_news,
+        datetime.now(TZ) - timedelta(days=1),
+        datetime.now(TZ) + timedelta(days=1),
+    )
 
 
 async def scrap_forex_factory_event_timeline(event_id: int) -> list[dict]:
     url = f"https://www.forexfactory.com/calendar/graph/{event_id}?limit=200&site_id=1"
     try:
-        response = await fetch_url_async(url)
+        if is_replaying():
+            response = await scrape_archive.load_timeline(event_id)
+        else:
+            response = await fetch_url_async(url)
+            if scrape_archive:
+                await scrape_archive.save_timeline(event_id, response)
         return response["data"]["events"]
+    except CircuitOpenError as e:
+        logging.warning(f"Skipping timeline {event_id}: {e}")
+        return []
     except Exception as e:
         logging.exception("Error in get_event_data", exc_info=e)
         return []
@@ -46,13 +168,142 @@ async def scrap_forex_factory_event_timeline(event_id: int) -> list[dict]:
 
 async def get_forex_event(event_id: int) -> dict:
     url = f"https://faireconomy.media/calendar/{event_id}.json"
-    response = await http.get(url)
+    response = await conditional_get(url)
 
     if response.status_code != 200:
         return {}
     return response.json()
 
 
+async def fetch_forexfactory_calendar_range(
+    start_date: datetime,
+    end_date: datetime,
+    timeout: float = SCRAPER_TIMEOUT,
+    currencies: Optional[list[str]] = None,
+    impacts: Optional[list[int]] = None,
+) -> list[dict]:
+    """
+    Fetch the calendar between two dates in a single request, optionally only
+    for some ``currencies`` (e.g. ``["USD"]``) and ``impacts`` (3 is high).
+    """
+    filtered = currencies is not None or impacts is not None
+    body = {
+        "default_view": "today",
+        "impacts": impacts or [3, 2, 1],
+        "event_types": [1, 2, 3, 4, 5, 7, 8, 9, 10, 11],
+        "currencies": sorted(
+            FOREX_FACTORY_CURRENCIES[c] for c in currencies or FOREX_FACTORY_CURRENCIES
+        ),
+        "begin_date": start_date.strftime("%B %d, %Y"),
+        "end_date": end_date.strftime("%B %d, %Y"),
+    }
+
+    if is_replaying():
+        response = await scrape_archive.load_calendar(start_date, end_date)
+    else:
+        response = await post_url_async(
+            "https://www.forexfactory.com/calendar/apply-settings/1?navigation=0",
+            data=json.dumps(body),
+            timeout=timeout,
+        )
+        # a filtered payload would shadow the full calendar in the archive
+        if scrape_archive and not filtered:
+            await scrape_archive.save_calendar(start_date, end_date, response)
+    return [event for day in response["days"] for event in day["events"]]
+
+
+def split_date_range(
+    start_date: datetime, end_date: datetime, chunk: timedelta
+) -> list[tuple[datetime, datetime]]:
+    """Split an inclusive day range into consecutive ranges of at most ``chunk``."""
+    if chunk < timedelta(days=1):
+        raise ValueError("chunk must be at least one day")
+
+    ranges = []
+    chunk_start = start_date
+    while chunk_start.date() <= end_date.date():
+        chunk_end = min(chunk_start + chunk - timedelta(days=1), end_date)
+        ranges.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + timedelta(days=1)
+    return ranges
+
+
+async def fetch_forexfactory_calendar(
+    start_date: datetime,
+    end_date: datetime,
+    chunk: Optional[timedelta] = timedelta(days=7),
+    concurrency: int = 4,
+    retries: int = 2,
+    retry_delay: float = 2,
+    timeout: float = SCRAPER_TIMEOUT,
+    currencies: Optional[list[str]] = None,
+    impacts: Optional[list[int]] = None,
+) -> list[dict]:
+    """
+    Fetch the calendar events between two dates, see
+    ``fetch_forexfactory_calendar_range`` for ``currencies`` and ``impacts``.
+
+    The range is split into ``chunk`` sized pieces that are fetched
+    concurrently, each retried up to ``retries`` times with exponential
+    backoff. Events are merged and deduplicated by id. A chunk that still
+    fails is logged and skipped. If every chunk fails, the ``CircuitOpenError``
+    is raised when any chunk hit an open circuit, else the last error.
+    ``chunk=None`` fetches the whole range in a single request.
+    """
+    if chunk is None:
+        ranges = [(start_date, end_date)]
+    else:
+        ranges = split_date_range(start_date, end_date, chunk)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_chunk(chunk_start: datetime, chunk_end: datetime) -> list[dict]:
+        async with semaphore:
+            for attempt in range(retries + 1):
+                try:
+                    return await fetch_forexfactory_calendar_range(
+                        chunk_start,
+                        chunk_end,
+                        timeout=timeout,
+                        currencies=currencies,
+                        impacts=impacts,
+                    )
+                except CircuitOpenError:
+                    raise
+                except Exception as e:
+                    if attempt == retries:
+                        raise
+                    logging.warning(
+                        f"Error fetching calendar {chunk_start:%Y-%m-%d} to "
+                        f"{chunk_end:%Y-%m-%d}, retrying: {e!r}"
+                    )
+                    await asyncio.sleep(retry_delay * 2**attempt)
+
+    results = await asyncio.gather(
+        *(fetch_chunk(*r) for r in ranges), return_exceptions=True
+    )
+
+    events = {}
+    errors = []
+    for (chunk_start, chunk_end), result in zip(ranges, results):
+        if isinstance(result, Exception):
+            if not isinstance(result, CircuitOpenError):
+                logging.exception(
+                    f"Error fetching calendar {chunk_start:%Y-%m-%d} to "
+                    f"{chunk_end:%Y-%m-%d}",
+                    exc_info=result,
+                )
+            errors.append(result)
+            continue
+        for event in result:
+            events[event["id"]] = event
+
+    if errors and len(errors) == len(ranges):
+        # callers fall back to stored data on an open circuit, prefer it
+        circuit_errors = [e for e in errors if isinstance(e, CircuitOpenError)]
+        raise (circuit_errors or errors)[-1]
+    return list(events.values())
+
+
 async def get_forexfactory_trade_event(
     event_name: str, currency: str, db_trade_event: AsyncCollection
 ) -> Optional[ForexFactory]:
@@ -61,128 +312,518 @@ async def get_forexfactory_trade_event(
         return ForexFactory(**r)
 
 
-async def update_forexfactory_calendar(
-    db_news: AsyncCollection,
+def news_fingerprint(new: dict) -> str:
+    payload = json.dumps(new, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+async def upsert_changed_news(db_news: AsyncCollection, newses: list[dict]) -> int:
+    """
+    Upsert only the events whose fingerprint differs from the last one written.
+
+    Fingerprints are kept in ``news_fingerprints`` and stored on each document,
+    so after a restart they are loaded back from ``db_news`` instead of
+    rewriting the whole range. Returns the number of documents written.
+    """
+    collection = db_news.full_name
+    fingerprints = {new["event_id"]: news_fingerprint(new) for new in newses}
+
+    # look up into a local dict, the range may be larger than the LRU cache
+    known = {}
+    missing = []
+    for event_id in fingerprints:
+        if (fingerprint := news_fingerprints.get((collection, event_id))) is not None:
+            known[event_id] = fingerprint
+        else:
+            missing.append(event_id)
+    if missing:
+        async for doc in db_news.find(
+            {"event_id": {"$in": missing}},
+            {"_id": 0, "event_id": 1, "fingerprint": 1},
+        ):
+            if "fingerprint" in doc:
+                known[doc["event_id"]] = doc["fingerprint"]
+                news_fingerprints[(collection, doc["event_id"])] = doc["fingerprint"]
+
+    changed = [
+        new
+        for new in newses
+        if known.get(new["event_id"]) != fingerprints[new["event_id"]]
+    ]
+    if changed:
+        await db_news.bulk_write(
+            [
+                UpdateOne(
+                    {"event_id": new["event_id"]},
+                    {"$set": {**new, "fingerprint": fingerprints[new["event_id"]]}},
+                    upsert=True,
+                )
+                for new in changed
+            ],
+            ordered=False,
+        )
+        for new in changed:
+            news_fingerprints[(collection, new["event_id"])] = fingerprints[
+                new["event_id"]
+            ]
+
+    logging.info(f"Wrote {len(changed)}/{len(newses)} changed news events...")
+    return len(changed)
+
+
+def latest_actuals(newses: list[dict]) -> dict[int, list]:
+    """Map each ebase_id to ``[event_id, actual]`` of its latest released event."""
+    actuals = {}
+    for new in sorted(newses, key=lambda x: x["event_time"]):
+        if new["actual"] not in (None, ""):
+            actuals[new["ebase_id"]] = [new["event_id"], new["actual"]]
+    return actuals
+
+
+async def get_stale_timelines(
     db_timeline: AsyncCollection,
-    return_early: bool = False,
-    previous_news: list[dict] = None,
-    start_date: datetime = None,
-    end_date: datetime = None,
-) -> Union[list[News]]:
-    logging.info("Updating Forex Factory Calendar...")
+    newses: list[dict],
+    ttl: Optional[timedelta],
+    actuals: Optional[dict[int, list]] = None,
+) -> list[dict]:
+    """
+    Return the events in ``newses`` whose timeline needs to be fetched again.
 
-    current_date = datetime.now()
-    start_of_current_month = current_date.replace(day=1)
+    A timeline is stale when it was never fetched, when its event has a new
+    actual since the last fetch, or when it is older than ``ttl``. Freshness is
+    kept in ``timeline_freshness`` and stored on the timeline documents, so it
+    survives restarts. ``ttl=None`` treats every timeline as stale.
 
-    if not start_date or not end_date:
-        start_date = (current_date.replace(day=1) - timedelta(days=1)).replace(day=1)
-        end_date = (start_of_current_month + relativedelta(months=2)).replace(
-            day=1
-        ) - timedelta(days=1)
+    ``actuals`` is the ``latest_actuals`` to compare with, pass it when
+    ``newses`` holds only some of the events of each ebase_id.
+    """
+    if ttl is None:
+        return newses
 
-    body = {
-        "default_view": "today",
-        "impacts": [3, 2, 1],
-        "event_types": [1, 2, 3, 4, 5, 7, 8, 9, 10, 11],
-        "currencies": [1, 2, 3, 4, 5, 6, 7, 8, 9],
-        "begin_date": start_date.strftime("%B %d, %Y"),
-        "end_date": end_date.strftime("%B %d, %Y"),
+    collection = db_timeline.full_name
+    known = {}
+    missing = []
+    for new in newses:
+        if freshness := timeline_freshness.get((collection, new["ebase_id"])):
+            known[new["ebase_id"]] = freshness
+        else:
+            missing.append(new["ebase_id"])
+    if missing:
+        async for doc in db_timeline.find(
+            {"ebase_id": {"$in": missing}, "fetched_at": {"$exists": True}},
+            {"_id": 0, "ebase_id": 1, "fetched_at": 1, "last_actual": 1},
+        ):
+            fetched_at = doc["fetched_at"]
+            if fetched_at.tzinfo is None:
+                fetched_at = fetched_at.replace(tzinfo=pytz.UTC)
+            known[doc["ebase_id"]] = {
+                "fetched_at": fetched_at,
+                "last_actual": doc.get("last_actual"),
+            }
+            timeline_freshness[(collection, doc["ebase_id"])] = known[doc["ebase_id"]]
+
+    now = datetime.now(pytz.UTC)
+    if actuals is None:
+        actuals = latest_actuals(newses)
+    stale = []
+    for new in newses:
+        freshness = known.get(new["ebase_id"])
+        if (
+            not freshness
+            or now - freshness["fetched_at"] >= ttl
+            or freshness["last_actual"] != actuals.get(new["ebase_id"])
+        ):
+            stale.append(new)
+    return stale
+
+
+def merge_timeline(
+    state: Optional[dict], news_line: list[dict]
+) -> tuple[dict, Optional[dict]]:
+    """
+    Build the ``news_line`` update for a fetched timeline.
+
+    ``state`` is what was last written for the timeline: its high-water mark
+    (the newest ``TIMELINE_POINT_KEY``) and its newest ``TIMELINE_TAIL``
+    points. Points past the high-water mark are appended with ``$push``,
+    keeping the fetched order and at most ``TIMELINE_LIMIT`` points. The whole
+    array is rewritten only when there is no state, a tail point was revised
+    or the points have no key. Returns the update operators and the new state.
+    """
+    if not news_line or any(TIMELINE_POINT_KEY not in p for p in news_line):
+        return {"$set": {"news_line": news_line}}, None
+
+    keys = [p[TIMELINE_POINT_KEY] for p in news_line]
+    tail = sorted(news_line, key=lambda p: p[TIMELINE_POINT_KEY])[-TIMELINE_TAIL:]
+    new_state = {
+        "high_water": max(keys),
+        "tail": {p[TIMELINE_POINT_KEY]: p for p in tail},
     }
+    full = {"$set": {"news_line": news_line, "high_water": new_state["high_water"]}}
+    if state is None:
+        return full, new_state
+
+    high_water = state["high_water"]
+    for p in news_line:
+        known = state["tail"].get(p[TIMELINE_POINT_KEY])
+        if known is not None and known != p:
+            return full, new_state
+
+    new_points = [p for p in news_line if p[TIMELINE_POINT_KEY] > high_water]
+    if not new_points:
+        return {}, new_state
 
-    req = scraper.post(
-        "https://www.forexfactory.com/calendar/apply-settings/1?navigation=0",
-        data=json.dumps(body),
+    descending = keys[0] > keys[-1]
+    return {
+        "$set": {"high_water": new_state["high_water"]},
+        "$push": {
+            "news_line": {
+                "$each": new_points,
+                "$sort": {TIMELINE_POINT_KEY: -1 if descending else 1},
+                "$slice": TIMELINE_LIMIT if descending else -TIMELINE_LIMIT,
+            }
+        },
+    }, new_state
+
+
+async def update_forexfactory_timelines(
+    newses: list[dict],
+    db_timeline: AsyncCollection,
+    concurrency: int = 4,
+    rate: float = 2.0,
+    burst: int = 1,
+    batch_size: int = 50,
+    flush_interval: float = 10,
+    ttl: Optional[timedelta] = timedelta(days=1),
+) -> int:
+    """
+    Fetch and store the timeline of every distinct ebase_id in ``newses``.
+
+    Up to ``concurrency`` timelines are fetched at once while a token bucket
+    keeps the request rate to forexfactory.com at ``rate`` per second. Writes
+    are batched through a ``BulkWriter``, appending only new points where
+    possible (see ``merge_timeline``). Timelines that are still fresh (see
+    ``get_stale_timelines``) are skipped. Returns the number of timelines stored.
+    """
+    # newest event first, one fetch per ebase_id
+    unique_newses = {}
+    for new in reversed(newses):
+        unique_newses.setdefault(new["ebase_id"], new)
+
+    collection = db_timeline.full_name
+    # over every event, the newest one of an ebase_id is often not released yet
+    actuals = latest_actuals(newses)
+    stale_newses = await get_stale_timelines(
+        db_timeline, list(unique_newses.values()), ttl=ttl, actuals=actuals
+    )
+    logging.info(
+        f"{len(stale_newses)}/{len(unique_newses)} timelines are stale, fetching..."
     )
-    days = req.json()["days"]
-
-    newses = []
-    for day in days:
-        for event in day["events"]:
-            event_name = re.sub(r"\b\w/\w\b", replace_x_x, event["name"])
-            utc_timestamp = event["dateline"]
-            event_time = datetime.fromtimestamp(utc_timestamp, pytz.UTC)
-            all_day = True if event["timeLabel"] == "All Day" else False
-            rating = (
-                3
-                if "High" in event["impactTitle"]
-                else 2
-                if "Medium" in event["impactTitle"]
-                else 1
+
+    bucket = TokenBucket(rate=rate, capacity=burst)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(new: dict, writer: BulkWriter):
+        async with semaphore:
+            # replays never touch forexfactory.com, so skip the rate limit
+            if not is_replaying():
+                await bucket.acquire()
+            news_line = await scrap_forex_factory_event_timeline(new["event_id"])
+            if not news_line:
+                return
+
+            freshness = {
+                "fetched_at": datetime.now(pytz.UTC),
+                "last_actual": actuals.get(new["ebase_id"]),
+            }
+            key = (collection, new["ebase_id"])
+            update, state = merge_timeline(timeline_tails.get(key), news_line)
+            update["$set"] = {
+                **update.get("$set", {}),
+                "event_id": new["event_id"],
+                **freshness,
+            }
+
+            def on_flush(ok: bool):
+                # only trust what reached the db, a failed (possibly partial)
+                # batch is refetched and rewritten in full next time
+                if ok:
+                    timeline_freshness[key] = freshness
+                if ok and state:
+                    timeline_tails[key] = state
+                else:
+                    timeline_tails.pop(key, None)
+
+            await writer.add(
+                UpdateOne(
+                    {
+                        "event_name": new["event_name"],
+                        "currency": new["currency"],
+                        "ebase_id": new["ebase_id"],
+                    },
+                    update,
+                    upsert=True,
+                ),
+                on_flush=on_flush,
             )
 
-            newses.append(
-                {
-                    "event_id": event["id"],
-                    "event_time": event_time,
-                    "utc_timestamp": utc_timestamp,
-                    "all_day": all_day,
-                    "country": event["country"],
-                    "currency": event["currency"],
-                    "rating": rating,
-                    "event_name": event_name,
-                    "actual": event["actual"],
-                    "forecast": event["forecast"],
-                    "previous": event["previous"],
-                    "verdict": event["actualBetterWorse"],
-                    "soloUrl": event["soloUrl"],
-                    "ebase_id": event["ebaseId"],
-                    "hasGraph": event["hasGraph"],
-                }
+    started_at = time.monotonic()
+    async with BulkWriter(
+        db_timeline, batch_size=batch_size, flush_interval=flush_interval
+    ) as writer:
+        results = await asyncio.gather(
+            *(fetch_one(new, writer) for new in stale_newses),
+            return_exceptions=True,
+        )
+    for e in results:
+        if isinstance(e, Exception):
+            logging.exception("Error in getting news timeline", exc_info=e)
+    stored = writer.written
+
+    elapsed = time.monotonic() - started_at
+    logging.info(
+        f"Stored {stored}/{len(stale_newses)} timelines in {elapsed:.1f}s "
+        f"({len(stale_newses) / elapsed if elapsed else 0:.2f} events/s)"
+    )
+    return stored
+
+
+def parse_forexfactory_event(event: dict) -> dict:
+    utc_timestamp = event["dateline"]
+    event_time = datetime.fromtimestamp(utc_timestamp, pytz.UTC)
+    all_day = True if event["timeLabel"] == "All Day" else False
+
+    return {
+        "event_id": event["id"],
+        "event_time": event_time,
+        "utc_timestamp": utc_timestamp,
+        "all_day": all_day,
+        "country": sys.intern(event["country"]),
+        "currency": sys.intern(event["currency"]),
+        "rating": impact_rating(event["impactTitle"]),
+        "event_name": normalize_event_name(event["name"]),
+        "actual": event["actual"],
+        "forecast": event["forecast"],
+        "previous": event["previous"],
+        "verdict": event["actualBetterWorse"],
+        "soloUrl": event["soloUrl"],
+        "ebase_id": event["ebaseId"],
+        "hasGraph": event["hasGraph"],
+        "source": NewsSource.FOREX_FACTORY.value,
+    }
+
+
+class ForexFactorySource(CalendarSource):
+    source = NewsSource.FOREX_FACTORY
+
+    def __init__(
+        self,
+        chunk: Optional[timedelta] = timedelta(days=7),
+        concurrency: int = 4,
+        timeout: float = SCRAPER_TIMEOUT,
+    ):
+        self.chunk = chunk
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    async def fetch(self, start_date: datetime, end_date: datetime) -> list[dict]:
+        events = await fetch_forexfactory_calendar(
+            start_date,
+            end_date,
+            chunk=self.chunk,
+            concurrency=self.concurrency,
+            timeout=self.timeout,
+        )
+        with metrics.stage("parse", count=len(events)):
+            return [parse_forexfactory_event(event) for event in events]
+
+
+def default_calendar_range() -> tuple[datetime, datetime]:
+    """From the start of last month to the end of next month."""
+    current_date = datetime.now()
+    start_of_current_month = current_date.replace(day=1)
+
+    start_date = (current_date.replace(day=1) - timedelta(days=1)).replace(day=1)
+    end_date = (start_of_current_month + relativedelta(months=2)).replace(
+        day=1
+    ) - timedelta(days=1)
+    return start_date, end_date
+
+
+def validate_news(newses: list[dict]) -> list[News]:
+    """``News`` of the valid events in ``newses``, newest first."""
+    r = []
+    with metrics.stage("validate", count=len(newses)):
+        for new in sorted(newses, key=lambda x: x["event_time"], reverse=True):
+            try:
+                r.append(News(**new))
+            except Exception as e:
+                # unreleased events without numbers are expected to fail
+                if (
+                    "actual" not in str(e)
+                    and "forecast" not in str(e)
+                    and "previous" not in str(e)
+                ):
+                    logging.exception("Error in parsing news", exc_info=e)
+    return r
+
+
+async def fetch_calendar(
+    sources: list[CalendarSource],
+    start_date: datetime,
+    end_date: datetime,
+    source_timeout: Optional[float] = None,
+) -> list[dict]:
+    """
+    Fetch every source concurrently and return their events oldest first.
+
+    A source that fails, or takes longer than ``source_timeout``, is logged and
+    skipped so it cannot hold up the others. When every source fails, a
+    ``CircuitOpenError`` is raised if any source hit an open circuit, else the
+    last error.
+    """
+
+    async def fetch(source: CalendarSource) -> list[dict]:
+        with metrics.stage(f"source_{source.source.name.lower()}") as stage:
+            newses = await asyncio.wait_for(
+                source.fetch(start_date, end_date), timeout=source_timeout
             )
+            stage.count = len(newses)
+            return newses
 
-    bulk_write = []
+    with metrics.stage("calendar_fetch") as stage:
+        results = await asyncio.gather(
+            *(fetch(source) for source in sources), return_exceptions=True
+        )
 
-    # sort news by event_time
-    newses = sorted(newses, key=lambda x: x["event_time"])
-    logging.info(f"Found {len(newses)} news events...")
+        newses = []
+        errors = []
+        for source, result in zip(sources, results):
+            if isinstance(result, CircuitOpenError):
+                logging.warning(f"Skipping {source.source.name} calendar: {result}")
+                errors.append(result)
+            elif isinstance(result, Exception):
+                logging.exception(
+                    f"Error fetching {source.source.name} calendar", exc_info=result
+                )
+                errors.append(result)
+            else:
+                newses.extend(result)
+        stage.count = len(newses)
+
+    if errors and len(errors) == len(sources):
+        circuit_errors = [e for e in errors if isinstance(e, CircuitOpenError)]
+        raise (circuit_errors or errors)[-1]
+    return sorted(newses, key=lambda x: x["event_time"])
 
-    # Iterate through each new item in the list of news
-    for new in newses:
-        filter_criteria = {"event_id": new["event_id"]}
-        update_operation = {"$set": new}
-        update_one_operation = UpdateOne(filter_criteria, update_operation, upsert=True)
-        bulk_write.append(update_one_operation)
 
-    await db_news.bulk_write(bulk_write)
+async def update_calendar(
+    db_news: AsyncCollection,
+    start_date: datetime,
+    end_date: datetime,
+    sources: list[CalendarSource] = None,
+    db_timeline: AsyncCollection = None,
+    previous_news: list[dict] = None,
+    timeline_concurrency: int = 4,
+    timeline_rate: float = 2.0,
+    timeline_ttl: Optional[timedelta] = timedelta(days=1),
+    source_timeout: Optional[float] = SOURCE_TIMEOUT,
+) -> list[News]:
+    """
+    Fetch the calendar from ``sources`` (``calendar_sources`` by default), store
+    the changed events and return them newest first.
+
+    With ``db_timeline`` the Forex Factory timelines are updated too. A source
+    slower than ``source_timeout`` seconds is skipped. When every source is
+    behind an open circuit the stored calendar is served.
+    """
+    sources = sources or calendar_sources or [ForexFactorySource()]
+    try:
+        newses = await fetch_calendar(sources, start_date, end_date, source_timeout)
+    except CircuitOpenError as e:
+        # we are being blocked, serve what we already have
+        logging.warning(f"{e}, serving stored calendar")
+        return await get_news_between(db_news, start_date, end_date)
+    logging.info(f"Found {len(newses)} news events...")
+
+    with metrics.stage("bulk_write") as stage:
+        stage.count = await upsert_changed_news(db_news, newses)
     if previous_news:
         newses = previous_news + newses
 
-    r = []
+    if db_timeline is not None:
+        # only Forex Factory events have a timeline
+        ff_newses = [
+            new
+            for new in newses
+            if new.get("source", NewsSource.FOREX_FACTORY.value)
+            == NewsSource.FOREX_FACTORY.value
+        ]
+        logging.info(f"Getting timeline for {len(ff_newses)} news events...")
+        with metrics.stage("timeline") as stage:
+            try:
+                stage.count = await update_forexfactory_timelines(
+                    ff_newses,
+                    db_timeline=db_timeline,
+                    concurrency=timeline_concurrency,
+                    rate=timeline_rate,
+                    ttl=timeline_ttl,
+                )
+            except Exception as e:
+                # the news is already stored, timelines are refetched next run
+                logging.exception("Error in updating timelines", exc_info=e)
 
-    logging.info(f"Getting timeline for {len(newses)} news events...")
+    return validate_news(newses)
 
-    done_timeline = []
-    for new in reversed(newses):
-        try:
-            if not return_early and new["ebase_id"] not in done_timeline:
-                done_timeline.append(new["ebase_id"])
-                if news_line := await scrap_forex_factory_event_timeline(
-                    new["event_id"]
-                ):
-                    await db_timeline.update_one(
-                        {
-                            "event_name": new["event_name"],
-                            "currency": new["currency"],
-                            "ebase_id": new["ebase_id"],
-                        },
-                        {
-                            "$set": {
-                                "event_id": new["event_id"],
-                                "news_line": news_line,
-                            }
-                        },
-                        upsert=True,
-                    )
-                    await asyncio.sleep(0.5)
-
-            n = News(**new)
-            r.append(n)
-        except Exception as e:
-            if (
-                "actual" not in str(e)
-                and "forecast" not in str(e)
-                and "previous" not in str(e)
-            ):
-                logging.exception("Error in getting news timeline", exc_info=e)
 
-    return r
+async def update_forexfactory_calendar(
+    db_news: AsyncCollection,
+    db_timeline: AsyncCollection,
+    return_early: bool = False,
+    previous_news: list[dict] = None,
+    start_date: datetime = None,
+    end_date: datetime = None,
+    timeline_concurrency: int = 4,
+    timeline_rate: float = 2.0,
+    timeline_ttl: Optional[timedelta] = timedelta(days=1),
+    calendar_chunk: Optional[timedelta] = timedelta(days=7),
+    calendar_concurrency: int = 4,
+    timeout: float = SCRAPER_TIMEOUT,
+    sources: list[CalendarSource] = None,
+    source_timeout: Optional[float] = SOURCE_TIMEOUT,
+) -> Union[list[News]]:
+    """
+    ``update_calendar`` over the default range, with Forex Factory as the
+    source unless ``sources`` or ``calendar_sources`` say otherwise.
+    ``return_early`` skips the timelines.
+
+    Without ``sources``, the Forex Factory source of ``calendar_sources`` is
+    replaced by one built from ``calendar_chunk``, ``calendar_concurrency``
+    and ``timeout``.
+    """
+    logging.info("Updating Forex Factory Calendar...")
+
+    if not start_date or not end_date:
+        start_date, end_date = default_calendar_range()
+
+    if sources is None:
+        forexfactory = ForexFactorySource(
+            chunk=calendar_chunk, concurrency=calendar_concurrency, timeout=timeout
+        )
+        sources = [
+            forexfactory if isinstance(source, ForexFactorySource) else source
+            for source in calendar_sources or [forexfactory]
+        ]
+
+    return await update_calendar(
+        db_news,
+        start_date,
+        end_date,
+        sources=sources,
+        db_timeline=None if return_early else db_timeline,
+        previous_news=previous_news,
+        timeline_concurrency=timeline_concurrency,
+        timeline_rate=timeline_rate,
+        timeline_ttl=timeline_ttl,
+        source_timeout=source_timeout,
+    )
@@ -0,0 +1,169 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from html.parser import HTMLParser
+from typing import Optional
+
+import pytz
+
+from dynamo_news.http import SCRAPER_TIMEOUT, post_url_async
+from dynamo_news.models import NewsSource
+
+
+class CalendarSource(ABC):
+    """
+    A calendar backend that returns events as dicts in the ``News`` shape.
+
+    Event ids must be unique across sources since every source is stored in
+    the same collection, and every event carries its ``source`` value.
+    """
+
+    source: NewsSource
+
+    @abstractmethod
+    async def fetch(self, start_date: datetime, end_date: datetime) -> list[dict]:
+        pass
+
+
+# td classes of the Investing.com calendar cells we read
+INVESTING_CELLS = ("time", "flagCur", "sentiment", "event", "act", "fore", "prev")
+
+
+class InvestingCalendarParser(HTMLParser):
+    """Collect the event rows of an Investing.com economic calendar table."""
+
+    def __init__(self):
+        super().__init__()
+        self.rows: list[dict] = []
+        self._row: Optional[dict] = None
+        self._cell: Optional[str] = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]):
+        attrs = dict(attrs)
+        if tag == "tr":
+            row_id = attrs.get("id") or ""
+            if row_id.startswith("eventRowId_"):
+                self._row = {
+                    "id": row_id.removeprefix("eventRowId_"),
+                    "ebase_id": attrs.get("event_attr_id"),
+                    "datetime": attrs.get("data-event-datetime"),
+                    "text": {},
+                }
+                self.rows.append(self._row)
+            else:
+                self._row = None
+        elif self._row is None:
+            return
+        elif tag == "td":
+            classes = (attrs.get("class") or "").split()
+            self._cell = next(
+                (name for name in INVESTING_CELLS if name in classes), None
+            )
+            if self._cell == "sentiment":
+                self._row["rating"] = attrs.get("data-img_key")
+            elif self._cell == "act":
+                self._row["verdict"] = (
+                    1 if "greenFont" in classes else 2 if "redFont" in classes else 0
+                )
+        elif tag == "span" and self._cell == "flagCur":
+            self._row["country"] = attrs.get("title") or ""
+        elif tag == "a" and self._cell == "event":
+            self._row["url"] = attrs.get("href") or ""
+
+    def handle_endtag(self, tag: str):
+        if tag == "td":
+            self._cell = None
+        elif tag == "tr":
+            self._row = None
+
+    def handle_data(self, data: str):
+        if self._row is not None and self._cell:
+            text = self._row["text"]
+            text[self._cell] = (text.get(self._cell, "") + data).strip()
+
+
+def parse_investing_calendar(html: str) -> list[dict]:
+    """Parse Investing.com calendar rows into dicts in the ``News`` shape."""
+    parser = InvestingCalendarParser()
+    parser.feed(html)
+
+    newses = []
+    for row in parser.rows:
+        if not row["datetime"]:
+            continue
+        text = row["text"]
+        event_time = datetime.strptime(row["datetime"], "%Y/%m/%d %H:%M:%S").replace(
+            tzinfo=pytz.UTC
+        )
+        rating = row.get("rating") or ""
+        newses.append(
+            {
+                "event_id": f"{NewsSource.INVESTING.value}:{row['id']}",
+                "event_time": event_time,
+                "utc_timestamp": int(event_time.timestamp()),
+                "all_day": text.get("time") == "All Day",
+                "country": row.get("country", ""),
+                "currency": text.get("flagCur", ""),
+                "rating": int(rating[-1]) if rating[-1:].isdigit() else 0,
+                "event_name": text.get("event", ""),
+                "actual": text.get("act", ""),
+                "forecast": text.get("fore", ""),
+                "previous": text.get("prev", ""),
+                "verdict": row.get("verdict", 0),
+                "soloUrl": row.get("url", ""),
+                "ebase_id": int(row["ebase_id"] or 0),
+                "hasGraph": False,
+                "source": NewsSource.INVESTING.value,
+            }
+        )
+    return newses
+
+
+class InvestingSource(CalendarSource):
+    """
+    Investing.com economic calendar, fetched through the shared cloudscraper.
+
+    ``time_zone`` is Investing's timezone id; the default (55) is UTC, which
+    ``parse_investing_calendar`` assumes.
+    """
+
+    source = NewsSource.INVESTING
+    url = "https://www.investing.com/economic-calendar/Service/getCalendarFilteredData"
+
+    def __init__(
+        self,
+        time_zone: int = 55,
+        max_pages: int = 20,
+        timeout: float = SCRAPER_TIMEOUT,
+    ):
+        self.time_zone = time_zone
+        self.max_pages = max_pages
+        self.timeout = timeout
+
+    async def fetch(self, start_date: datetime, end_date: datetime) -> list[dict]:
+        data = {
+            "dateFrom": start_date.strftime("%Y-%m-%d"),
+            "dateTo": end_date.strftime("%Y-%m-%d"),
+            "timeZone": self.time_zone,
+            "timeFilter": "timeOnly",
+            "currentTab": "custom",
+            "limit_from": 0,
+        }
+        headers = {
+            "X-Requested-With": "XMLHttpRequest",
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+
+        newses = {}
+        for page in range(self.max_pages):
+            response = await post_url_async(
+                self.url, data=data, headers=headers, timeout=self.timeout
+            )
+            for new in parse_investing_calendar(response["data"]):
+                newses[new["event_id"]] = new
+
+            # the calendar is paginated like an infinite scroll
+            if not response.get("bind_scroll_handler"):
+                break
+            data["limit_from"] = page + 1
+            data["last_time_scope"] = response.get("last_time_scope")
+        return list(newses.values())
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional, Union
+
+import pytz
+from pymongo.asynchronous.collection import AsyncCollection
+
+from dynamo_news.aio import CircuitOpenError, TokenBucket
+from dynamo_news.constant import FOREX_FACTORY_CURRENCIES, TZ, wait_for_result
+from dynamo_news.db import get_news_between
+from dynamo_news.http import release_executor, use_scraper_pool
+from dynamo_news.models import News
+from dynamo_news.scheduler import EventScheduler
+from dynamo_news.scrapper import (
+    fetch_forexfactory_calendar,
+    parse_forexfactory_event,
+    upsert_changed_news,
+)
+
+
+class ReleaseWatcher:
+    """
+    Poll the calendar around upcoming releases until their actuals are out.
+
+    Events that share an ``event_time`` are watched by a single poller. An
+    ``EventScheduler`` starts it ``lead`` seconds before the release, so
+    upcoming events are only polled while ``run`` is running. The poller
+    fetches the calendar of that day and the days around it, for the pending
+    events' currencies and impacts only, every ``poll_interval`` seconds until
+    every event has an actual or ``max_wait`` seconds have passed. All pollers
+    share a token bucket of ``rate`` requests per second. Each released event
+    is saved to ``db_news``, stored in ``wait_for_result`` under its event_id
+    and passed to ``on_release``.
+    """
+
+    def __init__(
+        self,
+        db_news: AsyncCollection,
+        on_release: Optional[Callable[[News], Awaitable[None]]] = None,
+        lead: float = 5,
+        poll_interval: float = 0.5,
+        max_wait: float = 300,
+        rate: float = 2.0,
+        burst: int = 2,
+    ):
+        self.db_news = db_news
+        self.on_release = on_release
+        self.lead = lead
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self._bucket = TokenBucket(rate=rate, capacity=burst)
+        self._scheduler = EventScheduler(
+            self._on_due, offsets={"release": timedelta(seconds=lead)}
+        )
+        self._pending: dict[datetime, dict[Union[int, str], News]] = {}
+        # event_id -> the event_time it is pending under
+        self._event_times: dict[Union[int, str], datetime] = {}
+        self._tasks: dict[datetime, asyncio.Task] = {}
+
+    def watch(self, newses: list[News]) -> int:
+        """
+        Watch the upcoming events in ``newses``, following those whose
+        event_time changed. Returns how many were added.
+        """
+        now = datetime.now(pytz.UTC)
+        added = 0
+        for news in newses:
+            if news.all_day or news.event_time + timedelta(seconds=self.max_wait) < now:
+                continue
+            # only Forex Factory is polled, other sources have prefixed ids
+            if isinstance(news.event_id, str):
+                continue
+            if wait_for_result.get(news.event_id) is not None:
+                continue
+
+            previous = self._event_times.get(news.event_id)
+            if previous == news.event_time:
+                continue
+            if previous is None:
+                added += 1
+            else:
+                self._unwatch(news.event_id, previous)
+            self._event_times[news.event_id] = news.event_time
+            self._pending.setdefault(news.event_time, {})[news.event_id] = news
+
+            if news.event_time - timedelta(seconds=self.lead) <= now:
+                # already past its wakeup, poll at once
+                self._scheduler.cancel(news.event_id)
+                self._start(news.event_time)
+            else:
+                self._scheduler.schedule(news)
+        return added
+
+    def _unwatch(self, event_id: Union[int, str], event_time: datetime):
+        pending = self._pending.get(event_time, {})
+        pending.pop(event_id, None)
+        if not pending and event_time not in self._tasks:
+            self._pending.pop(event_time, None)
+
+    async def _on_due(self, news: News, label: str):
+        self._start(news.event_time)
+
+    def _start(self, event_time: datetime):
+        if event_time in self._tasks or not self._pending.get(event_time):
+            return
+        task = asyncio.create_task(self._watch(event_time))
+        task.add_done_callback(lambda _: self._forget(event_time))
+        self._tasks[event_time] = task
+
+    def _forget(self, event_time: datetime):
+        self._tasks.pop(event_time, None)
+        self._pending.pop(event_time, None)
+        for event_id, watched_at in list(self._event_times.items()):
+            if watched_at == event_time:
+                del self._event_times[event_id]
+
+    async def _watch(self, event_time: datetime):
+        pending = self._pending[event_time]
+        deadline = event_time + timedelta(seconds=self.max_wait)
+        while pending and datetime.now(pytz.UTC) < deadline:
+            delay = self.poll_interval
+            try:
+                await self._poll(event_time, pending)
+            except CircuitOpenError as e:
+                logging.warning(f"{e}, pausing release polling")
+                delay = max(delay, e.retry_after)
+            except Exception as e:
+                logging.exception("Error in polling release", exc_info=e)
+            if pending:
+                await asyncio.sleep(delay)
+
+        if pending:
+            logging.warning(f"No actual released for {list(pending)} at {event_time}")
+
+    async def _poll(self, event_time: datetime, pending: dict):
+        currencies = {news.currency for news in pending.values()}
+        # Forex Factory groups days by its own timezone, not ours
+        day = event_time.astimezone(TZ)
+        await self._bucket.acquire()
+        # own threads, a running backfill must not delay the release
+        with use_scraper_pool(release_executor):
+            events = await fetch_forexfactory_calendar(
+                day - timedelta(days=1),
+                day + timedelta(days=1),
+                chunk=None,
+                retries=0,
+                currencies=(
+                    sorted(currencies)
+                    if currencies <= FOREX_FACTORY_CURRENCIES.keys()
+                    else None
+                ),
+                impacts=sorted({n.rating for n in pending.values()} & {1, 2, 3})
+                or None,
+            )
+        released = [
+            new
+            for new in map(parse_forexfactory_event, events)
+            if new["event_id"] in pending and new["actual"] not in (None, "")
+        ]
+        if not released:
+            return
+
+        await upsert_changed_news(self.db_news, released)
+        for new in released:
+            pending.pop(new["event_id"], None)
+            try:
+                news = News(**new)
+            except Exception as e:
+                logging.exception("Error in parsing released news", exc_info=e)
+                continue
+
+            wait_for_result[news.event_id] = news
+            logging.info(f"{news.currency} {news.event_name} released: {news.actual}")
+            if self.on_release:
+                try:
+                    await self.on_release(news)
+                except Exception as e:
+                    logging.exception("Error in on_release callback", exc_info=e)
+
+    async def run(
+        self,
+        horizon: timedelta = timedelta(hours=6),
+        interval: timedelta = timedelta(minutes=5),
+    ):
+        """Keep watching the stored events due within ``horizon``."""
+        scheduler = asyncio.create_task(self._scheduler.run())
+        try:
+            while True:
+                now = datetime.now(pytz.UTC)
+                self.watch(await get_news_between(self.db_news, now, now + horizon))
+                await asyncio.sleep(interval.total_seconds())
+        finally:
+            scheduler.cancel()
+            await asyncio.gather(scheduler, return_exceptions=True)
+            await self.close()
+
+    async def close(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
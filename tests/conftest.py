@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+
+class LeaseCollection:
+    """Just enough of a collection for the queries ``MongoLease`` makes."""
+
+    def __init__(self):
+        self.docs = {}
+
+    def _match(self, doc, query):
+        for key, value in query.items():
+            if key == "$or":
+                if not any(self._match(doc, q) for q in value):
+                    return False
+            elif isinstance(value, dict) and "$lte" in value:
+                if doc.get(key) is None or doc[key] > value["$lte"]:
+                    return False
+            elif doc.get(key) != value:
+                return False
+        return True
+
+    async def find_one_and_update(self, query, update, upsert=False, **kwargs):
+        doc = self.docs.get(query["_id"])
+        if doc is None:
+            doc = self.docs[query["_id"]] = {"_id": query["_id"]}
+        elif not self._match(doc, query):
+            raise DuplicateKeyError("duplicate key")
+        doc.update(update["$set"])
+        doc["token"] = doc.get("token", 0) + 1
+        return dict(doc)
+
+    async def update_one(self, query, update):
+        doc = self.docs.get(query["_id"])
+        if doc is not None and self._match(doc, query):
+            doc.update(update["$set"])
+            return SimpleNamespace(matched_count=1)
+        return SimpleNamespace(matched_count=0)
+
+    async def find_one(self, query, projection=None):
+        return self.docs.get(query["_id"])
+
+
+@pytest.fixture
+def lease_collection():
+    return LeaseCollection()
+
+
+@pytest.fixture
+def mock_http(monkeypatch):
+    """
+    Route the shared httpx client through ``httpx.MockTransport`` and give
+    every test its own caches, retry policy and in-flight table.
+    """
+    import httpx
+
+    from dynamo_news import http
+    from dynamo_news.aio import SingleFlight
+    from dynamo_news.cache import ConditionalCache, ResponseCache
+    from dynamo_news.retry import RetryPolicy
+
+    monkeypatch.setattr(http, "conditional_cache", ConditionalCache())
+    monkeypatch.setattr(http, "response_cache", ResponseCache())
+    monkeypatch.setattr(http, "retry_policy", RetryPolicy(base_delay=0))
+    monkeypatch.setattr(http, "http_flight", SingleFlight())
+    monkeypatch.setattr(http, "_revalidations", {})
+
+    def install(handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(http, "_client", client)
+        return client
+
+    return install
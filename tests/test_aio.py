@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from dynamo_news.aio import CircuitBreaker, CircuitOpenError
+
+
+async def fail():
+    await asyncio.sleep(0.01)
+    raise RuntimeError("boom")
+
+
+async def succeed():
+    return "ok"
+
+
+def test_concurrent_failures_open_circuit_once():
+    breaker = CircuitBreaker("test", failure_threshold=3, jitter=0)
+
+    async def main():
+        await asyncio.gather(
+            *(breaker.call(fail) for _ in range(8)), return_exceptions=True
+        )
+
+    asyncio.run(main())
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened == 1
+
+
+def test_failed_trial_doubles_backoff():
+    breaker = CircuitBreaker("test", failure_threshold=1, base_delay=0, jitter=0)
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await breaker.call(fail)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        with pytest.raises(RuntimeError):
+            await breaker.call(fail)
+        assert breaker.opened == 2
+        assert await breaker.call(succeed) == "ok"
+
+    asyncio.run(main())
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.opened == 0
+
+
+def test_open_circuit_fails_fast():
+    breaker = CircuitBreaker("test", failure_threshold=1, jitter=0)
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await breaker.call(fail)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(succeed)
+
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+import asyncio
+
+import httpx
+
+from dynamo_news import http as http_module
+from dynamo_news.cache import ResponseCache
+from dynamo_news.http import get_http, invalidate_http_cache
+
+
+def counting_handler():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.headers.get("X-API-KEY"))
+        return httpx.Response(200, json={"version": len(calls)})
+
+    return handler, calls
+
+
+def test_fresh_entry_is_served_from_cache(mock_http):
+    handler, calls = counting_handler()
+    mock_http(handler)
+
+    async def main():
+        first = await get_http("http://test/news", {"id": 1}, cache=True)
+        second = await get_http("http://test/news", {"id": 1}, cache=True)
+        other_key = await get_http("http://test/news", {"id": 1}, "k", cache=True)
+        return first, second, other_key
+
+    assert asyncio.run(main()) == ({"version": 1}, {"version": 1}, {"version": 2})
+    assert calls == [None, "k"]
+
+
+def test_stale_entry_is_served_while_revalidating(mock_http, monkeypatch):
+    handler, calls = counting_handler()
+    mock_http(handler)
+    monkeypatch.setattr(http_module, "response_cache", ResponseCache(ttl=0))
+
+    async def main():
+        first = await get_http("http://test/news", cache=True)
+        stale = await get_http("http://test/news", cache=True)
+        # the refresh runs in the background
+        await asyncio.gather(*http_module._revalidations.values())
+        refreshed = await get_http("http://test/news", cache=True)
+        await asyncio.gather(*http_module._revalidations.values())
+        return first, stale, refreshed
+
+    assert asyncio.run(main()) == ({"version": 1}, {"version": 1}, {"version": 2})
+    assert len(calls) == 3
+
+
+def test_failed_revalidation_keeps_the_stale_entry(mock_http, monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(1)
+        if len(calls) > 1:
+            return httpx.Response(404)
+        return httpx.Response(200, json={"version": 1})
+
+    mock_http(handler)
+    monkeypatch.setattr(http_module, "response_cache", ResponseCache(ttl=0))
+
+    async def main():
+        await get_http("http://test/news", cache=True)
+        await get_http("http://test/news", cache=True)
+        await asyncio.gather(*http_module._revalidations.values())
+        assert not http_module._revalidations
+        return await get_http("http://test/news", cache=True)
+
+    assert asyncio.run(main()) == {"version": 1}
+
+
+def test_expired_entry_is_refetched(mock_http, monkeypatch):
+    handler, calls = counting_handler()
+    mock_http(handler)
+    monkeypatch.setattr(
+        http_module, "response_cache", ResponseCache(ttl=0, stale_ttl=0)
+    )
+
+    async def main():
+        await get_http("http://test/news", cache=True)
+        return await get_http("http://test/news", cache=True)
+
+    assert asyncio.run(main()) == {"version": 2}
+    assert not http_module._revalidations
+
+
+def test_invalidate_forces_a_refetch(mock_http):
+    handler, calls = counting_handler()
+    mock_http(handler)
+
+    async def main():
+        await get_http("http://test/news", {"id": 1}, cache=True)
+        invalidate_http_cache("http://test/news", {"id": 1})
+        return await get_http("http://test/news", {"id": 1}, cache=True)
+
+    assert asyncio.run(main()) == {"version": 2}
+
+
+def test_uncached_requests_always_fetch(mock_http):
+    handler, calls = counting_handler()
+    mock_http(handler)
+
+    async def main():
+        await get_http("http://test/news")
+        return await get_http("http://test/news")
+
+    assert asyncio.run(main()) == {"version": 2}
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+import pytz
+
+from dynamo_news.cadence import ScrapeCadence
+from dynamo_news.models import News
+
+
+def make_news(actual: str, event_time: datetime) -> News:
+    return News(
+        event_id=1,
+        event_time=event_time,
+        all_day=False,
+        currency="USD",
+        rating=3,
+        event_name="cpi m/m",
+        actual=actual,
+        forecast="0.1%",
+        previous="0.2%",
+        verdict=0,
+        soloUrl="",
+        ebase_id=1,
+        hasGraph=False,
+    )
+
+
+def test_missing_actual_is_pending():
+    now = datetime.now(pytz.UTC)
+    news = make_news("", now - timedelta(minutes=1))
+
+    cadence = ScrapeCadence()
+    assert cadence.pending_actuals([news], now) == [news]
+    assert cadence.next_interval([news], now) == cadence.min_interval
+
+
+def test_zero_actual_is_released():
+    now = datetime.now(pytz.UTC)
+    news = make_news("0.0%", now - timedelta(minutes=1))
+
+    assert news.actual == 0
+    assert news.released
+    assert "released" not in news.model_dump()
+    assert ScrapeCadence().pending_actuals([news], now) == []
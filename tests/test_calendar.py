@@ -0,0 +1,194 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from dynamo_news import scrapper
+from dynamo_news.aio import CircuitOpenError
+from dynamo_news.models import NewsSource
+from dynamo_news.scrapper import fetch_forexfactory_calendar, update_calendar
+from dynamo_news.sources import CalendarSource
+
+
+def test_open_circuit_wins_over_other_chunk_errors(monkeypatch):
+    calls = []
+
+    async def fetch_range(start_date, end_date, **kwargs):
+        calls.append(start_date)
+        if len(calls) == 1:
+            raise CircuitOpenError("www.forexfactory.com", 30)
+        raise RuntimeError("blocked")
+
+    monkeypatch.setattr(scrapper, "fetch_forexfactory_calendar_range", fetch_range)
+    start = datetime(2025, 1, 1)
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(
+            fetch_forexfactory_calendar(
+                start,
+                start + timedelta(days=20),
+                concurrency=1,
+                retries=0,
+            )
+        )
+    assert len(calls) == 3
+
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield doc
+
+
+class NewsCollection:
+    full_name = "test.news"
+
+    def __init__(self):
+        self.operations = []
+
+    def find(self, *args, **kwargs):
+        return Cursor([])
+
+    async def bulk_write(self, operations, ordered=True):
+        self.operations.extend(operations)
+
+
+class StaticSource(CalendarSource):
+    def __init__(self, source: NewsSource, newses: list[dict] = None):
+        self.source = source
+        self.newses = newses
+
+    async def fetch(self, start_date, end_date):
+        if self.newses is None:
+            raise RuntimeError("source is down")
+        return self.newses
+
+
+def make_news(event_id, hour: int, source: NewsSource) -> dict:
+    event_time = datetime(2025, 1, 1, hour, tzinfo=pytz.UTC)
+    return {
+        "event_id": event_id,
+        "event_time": event_time,
+        "utc_timestamp": int(event_time.timestamp()),
+        "all_day": False,
+        "country": "US",
+        "currency": "USD",
+        "rating": 3,
+        "event_name": "cpi m/m",
+        "actual": "0.3",
+        "forecast": "0.2",
+        "previous": "0.1",
+        "verdict": 0,
+        "soloUrl": "",
+        "ebase_id": 1,
+        "hasGraph": False,
+        "source": source.value,
+    }
+
+
+def test_update_calendar_merges_sources_newest_first():
+    db_news = NewsCollection()
+    sources = [
+        StaticSource(
+            NewsSource.FOREX_FACTORY,
+            [
+                make_news(1, 8, NewsSource.FOREX_FACTORY),
+                make_news(2, 12, NewsSource.FOREX_FACTORY),
+            ],
+        ),
+        StaticSource(
+            NewsSource.INVESTING, [make_news("inews:1", 10, NewsSource.INVESTING)]
+        ),
+    ]
+
+    newses = asyncio.run(
+        update_calendar(db_news, datetime(2025, 1, 1), datetime(2025, 1, 2), sources)
+    )
+
+    assert [n.event_id for n in newses] == [2, "inews:1", 1]
+    assert len(db_news.operations) == 3
+
+
+def test_update_calendar_skips_failing_source():
+    sources = [
+        StaticSource(NewsSource.FOREX_FACTORY),
+        StaticSource(
+            NewsSource.INVESTING, [make_news("inews:1", 10, NewsSource.INVESTING)]
+        ),
+    ]
+
+    newses = asyncio.run(
+        update_calendar(
+            NewsCollection(), datetime(2025, 1, 1), datetime(2025, 1, 2), sources
+        )
+    )
+
+    assert [n.event_id for n in newses] == ["inews:1"]
+
+
+def test_forexfactory_calendar_applies_its_settings_to_the_source(monkeypatch):
+    captured = {}
+
+    async def fake_update_calendar(db_news, start_date, end_date, sources, **kwargs):
+        captured["sources"] = sources
+        return []
+
+    investing = StaticSource(NewsSource.INVESTING)
+    monkeypatch.setattr(scrapper, "update_calendar", fake_update_calendar)
+    monkeypatch.setattr(
+        scrapper,
+        "calendar_sources",
+        [scrapper.ForexFactorySource(), investing],
+    )
+    asyncio.run(
+        scrapper.update_forexfactory_calendar(
+            NewsCollection(),
+            None,
+            calendar_chunk=timedelta(days=3),
+            calendar_concurrency=2,
+            timeout=10,
+        )
+    )
+
+    forexfactory, other = captured["sources"]
+    assert (forexfactory.chunk, forexfactory.concurrency, forexfactory.timeout) == (
+        timedelta(days=3),
+        2,
+        10,
+    )
+    assert other is investing
+
+
+class SlowSource(CalendarSource):
+    source = NewsSource.INVESTING
+
+    async def fetch(self, start_date, end_date):
+        await asyncio.sleep(10)
+        return []
+
+
+def test_forexfactory_calendar_skips_a_slow_source():
+    sources = [
+        StaticSource(
+            NewsSource.FOREX_FACTORY, [make_news(1, 8, NewsSource.FOREX_FACTORY)]
+        ),
+        SlowSource(),
+    ]
+
+    async def main():
+        return await asyncio.wait_for(
+            scrapper.update_forexfactory_calendar(
+                NewsCollection(),
+                None,
+                start_date=datetime(2025, 1, 1),
+                end_date=datetime(2025, 1, 2),
+                sources=sources,
+                source_timeout=0.05,
+            ),
+            timeout=2,
+        )
+
+    assert [n.event_id for n in asyncio.run(main())] == [1]
@@ -0,0 +1,88 @@
+import asyncio
+
+import httpx
+import pytest
+
+from dynamo_news.http import get_http, post_http
+
+
+def slow_handler(status: int = 200):
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.headers.get("X-API-KEY")))
+        call = len(calls)
+        # long enough for every concurrent caller to join
+        await asyncio.sleep(0.05)
+        return httpx.Response(status, json={"call": call})
+
+    return handler, calls
+
+
+def test_identical_gets_share_one_request(mock_http):
+    handler, calls = slow_handler()
+    mock_http(handler)
+
+    async def main():
+        return await asyncio.gather(
+            *(get_http("http://test/news", {"id": 1}) for _ in range(10)),
+            get_http("http://test/news", {"id": 1}, api_key="k"),
+        )
+
+    results = asyncio.run(main())
+    assert all(result == results[0] for result in results[:10])
+    assert results[10] != results[0]
+    assert set(calls) == {("GET", None), ("GET", "k")}
+    assert len(calls) == 2
+
+
+def test_posts_are_coalesced_only_when_asked(mock_http):
+    handler, calls = slow_handler()
+    mock_http(handler)
+
+    async def main():
+        await asyncio.gather(
+            *(post_http("http://test/news", json={"a": 1}) for _ in range(3))
+        )
+        assert len(calls) == 3
+
+        await asyncio.gather(
+            post_http("http://test/news", json={"a": 1}, coalesce=True),
+            post_http("http://test/news", json={"a": 1}, coalesce=True),
+            post_http("http://test/news", json={"a": 2}, coalesce=True),
+        )
+        assert len(calls) == 5
+
+    asyncio.run(main())
+
+
+def test_shared_error_reaches_every_caller(mock_http):
+    handler, calls = slow_handler(status=404)
+    mock_http(handler)
+
+    async def main():
+        return await asyncio.gather(
+            *(get_http("http://test/news") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(r, httpx.HTTPStatusError) for r in results)
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_request(mock_http):
+    handler, calls = slow_handler()
+    mock_http(handler)
+
+    async def main():
+        first = asyncio.create_task(get_http("http://test/news"))
+        second = asyncio.create_task(get_http("http://test/news"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == {"call": 1}
+    assert len(calls) == 1
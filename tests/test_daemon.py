@@ -0,0 +1,103 @@
+import asyncio
+from datetime import timedelta
+
+from dynamo_news.daemon import Service, Supervisor, run_leased
+from dynamo_news.lease import MongoLease
+
+
+def test_leased_service_runs_on_one_instance(lease_collection):
+    running = []
+
+    async def service(owner):
+        running.append(owner)
+        await asyncio.sleep(0.3)
+
+    async def main():
+        leases = [
+            MongoLease(
+                lease_collection,
+                "backfill",
+                ttl=timedelta(seconds=1),
+                owner=owner,
+                poll_interval=0.05,
+            )
+            for owner in ("a", "b")
+        ]
+        tasks = [
+            asyncio.create_task(run_leased(lease, lambda o=lease.owner: service(o)))
+            for lease in leases
+        ]
+        await asyncio.sleep(0.1)
+        assert len(running) == 1
+
+        # the holder stops, the other instance takes over
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        await asyncio.sleep(0.1)
+        assert sorted(running) == ["a", "b"]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+
+def test_supervisor_stops_after_a_service_returned():
+    async def main():
+        async def forever():
+            await asyncio.sleep(3600)
+
+        async def once():
+            pass
+
+        supervisor = Supervisor(
+            [
+                Service("once", once, restart="never"),
+                Service("forever", forever, restart="always"),
+            ]
+        )
+        run = asyncio.create_task(supervisor.run())
+        await asyncio.sleep(0.1)
+        assert not run.done()
+
+        supervisor.stop()
+        await asyncio.wait_for(run, timeout=1)
+
+    asyncio.run(main())
+
+
+def test_supervisor_returns_when_every_service_ended():
+    calls = []
+
+    async def main():
+        async def once():
+            calls.append("once")
+
+        async def failing():
+            calls.append("failing")
+            raise RuntimeError("boom")
+
+        supervisor = Supervisor(
+            [
+                Service("once", once, restart="on-failure"),
+                Service("failing", failing, restart="never"),
+            ]
+        )
+        await asyncio.wait_for(supervisor.run(), timeout=1)
+
+    asyncio.run(main())
+    assert sorted(calls) == ["failing", "once"]
+
+
+def test_supervisor_restarts_a_failed_service():
+    calls = []
+
+    async def main():
+        async def flaky():
+            calls.append(len(calls))
+            if len(calls) < 3:
+                raise RuntimeError("boom")
+
+        service = Service("flaky", flaky, restart="on-failure", backoff=0.01)
+        await asyncio.wait_for(Supervisor([service]).run(), timeout=1)
+        assert service.restarts == 2
+
+    asyncio.run(main())
+    assert calls == [0, 1, 2]
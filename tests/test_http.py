@@ -0,0 +1,97 @@
+import asyncio
+
+import httpx
+
+import dynamo_news
+from dynamo_news import http as http_module
+from dynamo_news.http import HTTPConfig, configure_http, get_client
+
+
+def test_configure_http_closes_old_client_after_in_flight_requests(monkeypatch):
+    async def main():
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            started.set()
+            await release.wait()
+            return httpx.Response(200, content=b"ok")
+
+        old = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(http_module, "_client", old)
+        monkeypatch.setattr(http_module, "http_config", http_module.http_config)
+
+        request = asyncio.create_task(http_module._request("GET", "http://test/"))
+        await started.wait()
+        await configure_http(HTTPConfig())
+
+        new = get_client()
+        assert new is not old
+        assert http_module.http is new
+        assert not old.is_closed
+
+        release.set()
+        response = await request
+        assert response.content == b"ok"
+        assert old.is_closed
+        assert not http_module._in_flight
+        await new.aclose()
+
+    asyncio.run(main())
+
+
+def test_configure_http_closes_idle_client_at_once(monkeypatch):
+    async def main():
+        old = httpx.AsyncClient()
+        monkeypatch.setattr(http_module, "_client", old)
+        monkeypatch.setattr(http_module, "http_config", http_module.http_config)
+        await configure_http(HTTPConfig())
+        assert old.is_closed
+        await get_client().aclose()
+
+    asyncio.run(main())
+
+
+def test_package_http_is_the_module():
+    assert dynamo_news.http is http_module
+    assert http_module.http is get_client()
+
+
+def test_304_without_cached_copy_refetches_in_full(mock_http):
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match"):
+            # evicted between sending the validators and the answer
+            http_module.conditional_cache.clear()
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, content=b"body")
+
+    mock_http(handler)
+
+    async def main():
+        first = await http_module.conditional_get("http://test/")
+        second = await http_module.conditional_get("http://test/")
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert seen == [None, '"v1"', None]
+    assert first.content == second.content == b"body"
+    assert second.status_code == 200
+
+
+def test_304_serves_the_cached_response(mock_http):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"'}, content=b"body")
+
+    mock_http(handler)
+
+    async def main():
+        await http_module.conditional_get("http://test/")
+        return await http_module.conditional_get("http://test/")
+
+    assert asyncio.run(main()).content == b"body"
+    assert http_module.conditional_cache.hits == 1
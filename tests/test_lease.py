@@ -0,0 +1,55 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from dynamo_news.lease import LeaseLostError, MongoLease
+
+
+def make_lease(collection, owner, ttl=0.3):
+    return MongoLease(collection, "scrape", ttl=timedelta(seconds=ttl), owner=owner)
+
+
+def test_lease_is_exclusive_and_renewed(lease_collection):
+    async def main():
+        collection = lease_collection
+        a, b = make_lease(collection, "a"), make_lease(collection, "b")
+        assert await a.acquire()
+        assert not await b.acquire()
+        async with a.holding():
+            await asyncio.sleep(0.5)
+            assert not await b.acquire()
+        assert await a.last_completed() is not None
+        assert await b.acquire()
+        assert b.token == 2
+
+    asyncio.run(main())
+
+
+def test_expired_lease_is_taken_over(lease_collection):
+    async def main():
+        collection = lease_collection
+        a, b = make_lease(collection, "a"), make_lease(collection, "b")
+        assert await a.acquire()
+        await asyncio.sleep(0.35)
+        assert await b.acquire()
+        assert not await a.renew()
+        await a.release()
+        assert collection.docs["scrape"]["owner"] == "b"
+
+    asyncio.run(main())
+
+
+def test_lost_lease_cancels_the_block(lease_collection):
+    async def main():
+        collection = lease_collection
+        a = make_lease(collection, "a")
+        assert await a.acquire()
+        with pytest.raises(LeaseLostError):
+            async with a.holding():
+                # another instance takes over while we are stuck
+                collection.docs["scrape"].update(owner="b", token=99)
+                await asyncio.sleep(1)
+        assert collection.docs["scrape"]["owner"] == "b"
+
+    asyncio.run(main())
@@ -0,0 +1,23 @@
+import dynamo_news
+from dynamo_news.metrics import Metrics, metrics
+
+
+def test_package_metrics_is_the_module():
+    assert dynamo_news.metrics.Metrics is Metrics
+    assert dynamo_news.metrics.metrics is metrics
+
+
+def test_stage_reports_to_hooks_and_survives_a_failing_hook():
+    registry = Metrics()
+    seen = []
+
+    def failing(stage, duration, count):
+        raise RuntimeError("hook failed")
+
+    registry.add_hook(failing)
+    registry.add_hook(lambda *args: seen.append(args))
+    with registry.stage("parse") as stage:
+        stage.count = 3
+
+    assert [(name, count) for name, _, count in seen] == [("parse", 3)]
+    assert registry.last["parse"][1] == 3
@@ -0,0 +1,108 @@
+import asyncio
+
+import httpx
+import pytest
+
+from dynamo_news import http as http_module
+from dynamo_news.http import get_http, post_http
+from dynamo_news.retry import RetryBudget, RetryPolicy
+
+
+def responses(*statuses):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        return httpx.Response(status, json={"ok": status == 200})
+
+    return handler, calls
+
+
+def test_get_retries_transient_statuses(mock_http):
+    handler, calls = responses(503, 502, 200)
+    mock_http(handler)
+
+    assert asyncio.run(get_http("http://test/news")) == {"ok": True}
+    assert calls == ["GET"] * 3
+
+
+def test_get_gives_up_after_max_attempts(mock_http):
+    handler, calls = responses(503)
+    mock_http(handler)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(get_http("http://test/news"))
+    assert len(calls) == http_module.retry_policy.max_attempts
+
+
+def test_post_is_retried_only_when_idempotent(mock_http):
+    handler, calls = responses(503, 200)
+    mock_http(handler)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(post_http("http://test/orders", json={"a": 1}))
+    assert calls == ["POST"]
+
+    calls.clear()
+    result = asyncio.run(post_http("http://test/news", json={"a": 1}, idempotent=True))
+    assert result == {"ok": True}
+    assert calls == ["POST", "POST"]
+
+
+def test_other_errors_are_not_retried(mock_http):
+    handler, calls = responses(404)
+    mock_http(handler)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(get_http("http://test/news"))
+    assert calls == ["GET"]
+
+
+def test_transport_errors_are_retried_then_raised():
+    attempts = []
+
+    async def request():
+        attempts.append(1)
+        raise httpx.ConnectError("refused")
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0)
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(policy.send("GET", request))
+    assert len(attempts) == 3
+
+
+def test_retry_after_is_honoured_and_capped():
+    policy = RetryPolicy(base_delay=0.1, max_delay=5)
+
+    assert policy.backoff(0, httpx.Response(503, headers={"Retry-After": "2"})) == 2
+    assert policy.backoff(0, httpx.Response(503, headers={"Retry-After": "60"})) == 5
+    # an HTTP date is not parsed, fall back to jittered backoff
+    delay = policy.backoff(
+        3, httpx.Response(503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    )
+    assert 0 <= delay <= 0.8
+
+
+def test_budget_caps_retries():
+    budget = RetryBudget(ratio=0.5, min_retries=1, window=60)
+    for _ in range(4):
+        budget.record_request()
+
+    assert [budget.try_retry() for _ in range(3)] == [True, True, False]
+
+
+def test_exhausted_budget_stops_retrying():
+    attempts = []
+
+    async def request():
+        attempts.append(1)
+        return httpx.Response(503)
+
+    policy = RetryPolicy(
+        max_attempts=5, base_delay=0, budget=RetryBudget(ratio=0, min_retries=1)
+    )
+    response = asyncio.run(policy.send("GET", request))
+    assert response.status_code == 503
+    # one retry allowed by the budget, then it is exhausted
+    assert len(attempts) == 2
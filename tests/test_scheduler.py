@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytz
+
+from dynamo_news.models import News
+from dynamo_news.scheduler import EventScheduler
+
+OFFSETS = {"soon": timedelta(seconds=0.2), "live": timedelta(seconds=0.1)}
+
+
+def make_news(event_id: int, event_time: datetime) -> News:
+    return News(
+        event_id=event_id,
+        event_time=event_time,
+        all_day=False,
+        currency="USD",
+        rating=3,
+        event_name="cpi m/m",
+        actual="",
+        forecast="0.2%",
+        previous="0.1%",
+        verdict=0,
+        soloUrl="",
+        ebase_id=event_id,
+        hasGraph=False,
+    )
+
+
+def run_scheduler(scheduler: EventScheduler, newses: list[News], seconds: float):
+    async def main():
+        task = asyncio.create_task(scheduler.run())
+        scheduler.load(newses)
+        await asyncio.sleep(seconds)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
+
+
+def test_fires_every_offset_in_order():
+    fired = []
+
+    async def callback(news, label):
+        fired.append((news.event_id, label))
+
+    now = datetime.now(pytz.UTC)
+    scheduler = EventScheduler(callback, OFFSETS)
+    newses = [
+        make_news(2, now + timedelta(seconds=0.5)),
+        make_news(1, now + timedelta(seconds=0.4)),
+    ]
+    run_scheduler(scheduler, newses, 0.6)
+
+    assert fired == [(1, "soon"), (2, "soon"), (1, "live"), (2, "live")]
+    assert len(scheduler) == 0
+
+
+def test_skips_past_offsets_and_cancelled_events():
+    fired = []
+
+    async def callback(news, label):
+        fired.append((news.event_id, label))
+
+    now = datetime.now(pytz.UTC)
+    scheduler = EventScheduler(callback, OFFSETS)
+    scheduler.load([make_news(1, now + timedelta(seconds=0.15))])
+    scheduler.load([make_news(2, now + timedelta(seconds=0.3))])
+    assert len(scheduler) == 3
+
+    scheduler.cancel(2)
+    run_scheduler(scheduler, [], 0.3)
+
+    assert fired == [(1, "live")]
+
+
+def test_reschedule_moves_the_firings():
+    fired = []
+
+    async def callback(news, label):
+        fired.append((news.event_time, label))
+
+    now = datetime.now(pytz.UTC)
+    scheduler = EventScheduler(callback, {"live": timedelta(0)})
+    scheduler.schedule(make_news(1, now + timedelta(hours=1)))
+    moved = now + timedelta(seconds=0.1)
+    scheduler.schedule(make_news(1, moved))
+
+    assert scheduler.next_fire_at() == moved
+    run_scheduler(scheduler, [], 0.3)
+    assert fired == [(moved, "live")]
+
+
+def test_a_failing_callback_does_not_stop_the_scheduler():
+    fired = []
+
+    async def callback(news, label):
+        fired.append(news.event_id)
+        if news.event_id == 1:
+            raise RuntimeError("send failed")
+
+    now = datetime.now(pytz.UTC)
+    scheduler = EventScheduler(callback, {"live": timedelta(0)})
+    newses = [
+        make_news(1, now + timedelta(seconds=0.05)),
+        make_news(2, now + timedelta(seconds=0.1)),
+    ]
+    run_scheduler(scheduler, newses, 0.3)
+
+    assert fired == [1, 2]
@@ -0,0 +1,160 @@
+import asyncio
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from dynamo_news import scrapper
+from dynamo_news.scrapper import (
+    TIMELINE_LIMIT,
+    merge_timeline,
+    update_forexfactory_timelines,
+)
+
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield doc
+
+
+class TimelineCollection:
+    full_name = "test.timeline"
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.operations: list[UpdateOne] = []
+
+    def find(self, *args, **kwargs):
+        return Cursor([])
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.fail:
+            raise RuntimeError("bulk write failed")
+        self.operations.extend(operations)
+
+
+def points(*keys):
+    return [{"dateline": k, "actual": str(k)} for k in keys]
+
+
+def make_news(ebase_id: int) -> dict:
+    return {
+        "event_id": ebase_id * 10,
+        "event_name": "cpi m/m",
+        "event_time": datetime(2025, 1, ebase_id + 1),
+        "currency": "USD",
+        "ebase_id": ebase_id,
+        "actual": "0.3",
+    }
+
+
+def test_merge_timeline_without_state_rewrites():
+    update, state = merge_timeline(None, points(3, 2, 1))
+    assert update == {"$set": {"news_line": points(3, 2, 1), "high_water": 3}}
+    assert state["high_water"] == 3
+
+
+def test_merge_timeline_appends_new_points():
+    _, state = merge_timeline(None, points(3, 2, 1))
+    update, state = merge_timeline(state, points(5, 4, 3, 2, 1))
+
+    push = update["$push"]["news_line"]
+    assert push["$each"] == points(5, 4)
+    assert push["$sort"] == {"dateline": -1}
+    assert push["$slice"] == TIMELINE_LIMIT
+    assert update["$set"] == {"high_water": 5}
+    assert state["high_water"] == 5
+
+
+def test_merge_timeline_ascending_keeps_newest():
+    _, state = merge_timeline(None, points(1, 2))
+    update, _ = merge_timeline(state, points(1, 2, 3))
+    assert update["$push"]["news_line"]["$sort"] == {"dateline": 1}
+    assert update["$push"]["news_line"]["$slice"] == -TIMELINE_LIMIT
+
+
+def test_merge_timeline_unchanged_is_noop():
+    _, state = merge_timeline(None, points(2, 1))
+    update, _ = merge_timeline(state, points(2, 1))
+    assert update == {}
+
+
+def test_merge_timeline_revised_point_rewrites():
+    _, state = merge_timeline(None, points(2, 1))
+    revised = [{"dateline": 2, "actual": "revised"}, *points(1)]
+    update, _ = merge_timeline(state, revised)
+    assert update["$set"]["news_line"] == revised
+    assert "$push" not in update
+
+
+def test_merge_timeline_without_keys_rewrites():
+    update, state = merge_timeline(None, [{"actual": "1"}])
+    assert update == {"$set": {"news_line": [{"actual": "1"}]}}
+    assert state is None
+
+
+def run_timelines(monkeypatch, collection, newses):
+    async def fetch_timeline(event_id):
+        return points(2, 1)
+
+    monkeypatch.setattr(scrapper, "scrap_forex_factory_event_timeline", fetch_timeline)
+    return asyncio.run(
+        update_forexfactory_timelines(newses, collection, rate=1000, burst=10)
+    )
+
+
+def test_failed_flush_leaves_timelines_stale(monkeypatch):
+    scrapper.timeline_freshness.clear()
+    scrapper.timeline_tails.clear()
+    newses = [make_news(i) for i in range(3)]
+
+    stored = run_timelines(monkeypatch, TimelineCollection(fail=True), newses)
+
+    assert stored == 0
+    assert len(scrapper.timeline_freshness) == 0
+    assert len(scrapper.timeline_tails) == 0
+
+
+def test_flushed_timelines_are_recorded(monkeypatch):
+    scrapper.timeline_freshness.clear()
+    scrapper.timeline_tails.clear()
+    newses = [make_news(i) for i in range(3)]
+    collection = TimelineCollection()
+
+    stored = run_timelines(monkeypatch, collection, newses)
+
+    assert stored == 3
+    assert len(collection.operations) == 3
+    assert len(scrapper.timeline_freshness) == 3
+    assert len(scrapper.timeline_tails) == 3
+
+
+def test_released_and_pending_event_of_one_ebase_id_stays_fresh(monkeypatch):
+    scrapper.timeline_freshness.clear()
+    scrapper.timeline_tails.clear()
+    released = make_news(1)
+    pending = {
+        **make_news(1),
+        "event_id": 11,
+        "event_time": datetime(2025, 2, 2),
+        "actual": "",
+    }
+    fetched = []
+
+    async def fetch_timeline(event_id):
+        fetched.append(event_id)
+        return points(2, 1)
+
+    monkeypatch.setattr(scrapper, "scrap_forex_factory_event_timeline", fetch_timeline)
+    collection = TimelineCollection()
+    for _ in range(3):
+        asyncio.run(
+            update_forexfactory_timelines(
+                [released, pending], collection, rate=1000, burst=10
+            )
+        )
+
+    assert fetched == [11]
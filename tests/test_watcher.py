@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytz
+
+from dynamo_news import watcher as watcher_module
+from dynamo_news.constant import TZ, wait_for_result
+from dynamo_news.models import News
+from dynamo_news.watcher import ReleaseWatcher
+
+
+def make_news(event_id: int, event_time: datetime, currency: str, rating: int):
+    return News(
+        event_id=event_id,
+        event_time=event_time,
+        all_day=False,
+        currency=currency,
+        rating=rating,
+        event_name="cpi m/m",
+        actual=0,
+        forecast=0.2,
+        previous=0.1,
+        verdict=0,
+        soloUrl="",
+        ebase_id=event_id,
+        hasGraph=False,
+    )
+
+
+def test_poll_fetches_only_pending_currencies_and_impacts(monkeypatch):
+    event_time = datetime.now(pytz.UTC).replace(microsecond=0) + timedelta(seconds=1)
+    calls = []
+    polled_at = []
+
+    async def fetch_calendar(start_date, end_date, **kwargs):
+        polled_at.append(datetime.now(pytz.UTC))
+        calls.append((start_date, end_date, kwargs))
+        return [
+            {
+                "id": 901,
+                "dateline": int(event_time.timestamp()),
+                "timeLabel": "8:30am",
+                "impactTitle": "High Impact Expected",
+                "country": "US",
+                "currency": "USD",
+                "name": "CPI m/m",
+                "actual": "0.4%",
+                "forecast": "0.2%",
+                "previous": "0.1%",
+                "actualBetterWorse": 1,
+                "soloUrl": "",
+                "ebaseId": 901,
+                "hasGraph": False,
+            }
+        ]
+
+    async def upsert(db_news, newses):
+        return len(newses)
+
+    monkeypatch.setattr(watcher_module, "fetch_forexfactory_calendar", fetch_calendar)
+    monkeypatch.setattr(watcher_module, "upsert_changed_news", upsert)
+
+    async def no_news(db_news, start_date, end_date):
+        return []
+
+    monkeypatch.setattr(watcher_module, "get_news_between", no_news)
+
+    async def main():
+        watcher = ReleaseWatcher(None, lead=0, poll_interval=0.01, max_wait=5)
+        run = asyncio.create_task(watcher.run())
+        added = watcher.watch(
+            [
+                make_news(901, event_time, "USD", 3),
+                make_news(902, event_time - timedelta(days=2), "EUR", 2),
+            ]
+        )
+        assert added == 1
+        # nothing polls before the scheduler wakes the release up
+        assert not watcher._tasks
+
+        async def released():
+            while wait_for_result.get(901) is None:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(released(), timeout=5)
+        run.cancel()
+        await asyncio.gather(run, return_exceptions=True)
+
+    asyncio.run(main())
+
+    assert len(calls) == 1
+    assert polled_at[0] >= event_time
+    start_date, end_date, kwargs = calls[0]
+    # Forex Factory may file the release under the day before or after ours
+    assert end_date - start_date == timedelta(days=2)
+    for zone in ("UTC", "America/New_York", "Australia/Brisbane"):
+        day = event_time.astimezone(pytz.timezone(zone)).date()
+        assert start_date.date() <= day <= end_date.date()
+    assert kwargs["currencies"] == ["USD"]
+    assert kwargs["impacts"] == [3]
+    assert start_date.tzinfo.zone == TZ.zone
+    assert wait_for_result.pop(901).actual == 0.4
+
+
+def test_rescheduled_release_moves_to_its_new_time():
+    async def main():
+        watcher = ReleaseWatcher(None, lead=0)
+        event_time = datetime.now(pytz.UTC) + timedelta(hours=1)
+        assert watcher.watch([make_news(903, event_time, "USD", 3)]) == 1
+
+        moved = event_time + timedelta(minutes=30)
+        assert watcher.watch([make_news(903, moved, "USD", 3)]) == 0
+        assert list(watcher._pending) == [moved]
+        assert watcher._scheduler.next_fire_at() == moved
+
+    asyncio.run(main())